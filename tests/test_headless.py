@@ -0,0 +1,24 @@
+from tofu_byte.config import PROJECT_DIR
+from tofu_byte.game.headless import HeadlessScene
+
+TUTORIAL = PROJECT_DIR / "maps" / "00_Tutorial"
+
+
+def test_idle_player_keeps_playing():
+    scene = HeadlessScene(TUTORIAL / "01_movement.json")
+    assert scene.run(200) is None
+    assert (scene.hp, scene.points, scene.max_points) == (1, 0, 6)
+
+
+def test_walking_collects_stars():
+    scene = HeadlessScene(TUTORIAL / "01_movement.json", [{"r"}] * 200)
+    assert scene.run(200) is None
+    assert scene.points == 2
+    assert scene.hp == 1
+
+
+def test_falling_off_the_map_loses():
+    scene = HeadlessScene(TUTORIAL / "02_stick_to_celling.json", [{"r"}] * 200)
+    assert scene.run(200) is False
+    assert scene.hp == 0
+    assert scene.frame < 200
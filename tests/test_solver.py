@@ -0,0 +1,19 @@
+import pytest
+
+from tofu_byte.config import PROJECT_DIR
+from tofu_byte.game.headless import HeadlessScene
+from tofu_byte.game.solver import solve
+
+TUTORIAL = PROJECT_DIR / "maps" / "00_Tutorial"
+
+
+@pytest.mark.parametrize("name", ["01_movement", "02_stick_to_celling"])
+def test_solution_wins_when_replayed(name: str):
+    map_file = TUTORIAL / f"{name}.json"
+    solution = solve(map_file)
+    assert solution.solved
+
+    scene = HeadlessScene(map_file, solution.replay().frames())
+    assert scene.run(len(solution.inputs) + 1) is True
+    assert scene.points == scene.max_points
+    assert scene.hp == 1
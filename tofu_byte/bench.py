@@ -0,0 +1,264 @@
+"""Replays maps without a terminal and reports how long each frame stage takes.
+
+Animations only run in the app mode, the effects column is missing in headless.
+
+    tofubyte-bench --frames 600 --output before.json
+    tofubyte-bench --mode app --maps "00_Tutorial/*"
+    tofubyte-bench --compare before.json after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from tofu_byte.config import DEBUG, GAME_VERSION, PROJECT_DIR
+from tofu_byte.game.headless import HeadlessScene
+from tofu_byte.game.replay import Replay
+from tofu_byte.tools.tools import Direction, pressed
+
+MAPS_DIR = PROJECT_DIR / "maps"
+# Headless runs have their own stages after "remove", see `HeadlessScene.tick_perf`
+STAGES = [
+    "clear",
+    "input",
+    "coll",
+    "states",
+    "effects",
+    "remove",
+    "advance",
+    "messages",
+    "med",
+    "show",
+]
+PERCENTILES = [50, 90, 99]
+MIN_DIFF_US = 3
+
+Samples = dict[str, list[int]]
+Stats = dict[str, dict[str, float]]
+
+SCRIPT_MOVES: list[frozenset[Direction]] = [
+    pressed(),
+    pressed("r"),
+    pressed("l"),
+    pressed("u"),
+    pressed("r", "u"),
+    pressed("l", "u"),
+    pressed("d"),
+]
+
+
+def find_maps(pattern: str) -> list[Path]:
+    return sorted(p for p in MAPS_DIR.glob(f"{pattern}.json") if p.is_file())
+
+
+def map_key(map_file: Path) -> str:
+    return map_file.relative_to(MAPS_DIR).with_suffix("").as_posix()
+
+
+def scripted_replay(map_file: Path, frames: int, seed: int) -> Replay:
+    # Random, but the same for every run with the same seed
+    rng = random.Random(f"{seed}:{map_key(map_file)}")
+    replay = Replay(map_file, seed)
+    while len(replay) < frames:
+        replay.runs.append((rng.randint(1, 15), rng.choice(SCRIPT_MOVES)))
+    return replay
+
+
+def replay_for(
+    map_file: Path, frames: int, seed: int, replays_dir: Path | None
+) -> Replay:
+    if replays_dir is not None:
+        recorded = sorted(replays_dir.glob(f"{map_file.stem}-*.replay"))
+        if recorded:
+            return Replay.load(recorded[-1])
+    return scripted_replay(map_file, frames, seed)
+
+
+def percentile(values: list[int], p: float) -> int:
+    # Nearest rank
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: Samples) -> Stats:
+    stats: Stats = {}
+    lengths = [len(v) for v in samples.values() if v]
+    if not lengths:
+        return stats
+    frames = min(lengths)
+    samples = {k: v[:frames] for k, v in samples.items() if v}
+    samples["frame"] = [sum(v[i] for v in samples.values()) for i in range(frames)]
+    for stage, values in samples.items():
+        stats[stage] = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+        stats[stage]["max"] = max(values)
+        stats[stage]["mean"] = round(sum(values) / len(values), 1)
+    return stats
+
+
+def bench_headless(replay: Replay, frames: int) -> Samples:
+    samples: Samples = defaultdict(list)
+    done = 0
+    # The map is loaded again when the game ends before enough frames are run
+    while done < frames:
+        scene = HeadlessScene(replay.map_file, replay.frames())
+        while not scene.finished and scene.frame < frames - done:
+            scene.tick_perf()
+        for stage, values in scene.step_times.items():
+            samples[stage].extend(values)
+        done += scene.frame
+    return samples
+
+
+async def bench_app(replays: list[Replay], frames: int) -> list[Samples]:
+    # Real game screen in a headless app, runs at the normal frame rate
+    from tofu_byte.game.game import Game
+    from tofu_byte.main import GameMenu
+    from tofu_byte.screens.game_display import GameScreenContainer
+    from tofu_byte.screens.menu.map_loader import MapChain
+
+    DEBUG["fps"] = "on"
+    Game.perf_samples = None
+    results: list[Samples] = []
+    app = GameMenu()
+    async with app.run_test(size=(160, 50)) as pilot:
+        for replay in replays:
+            samples: Samples = defaultdict(list)
+            screen: GameScreenContainer | None = None
+            while len(samples["show"]) < frames:
+                # Dying restarts the game on the same screen, winning closes it
+                if screen is None or screen not in app.screen_stack:
+                    screen = GameScreenContainer(
+                        MapChain(0, [replay.map_file]), test_only=True, replay=replay
+                    )
+                    await app.push_screen(screen)
+                while screen.game is None:
+                    await pilot.pause(0.05)
+                game = screen.game
+                left = frames - len(samples["show"])
+                while screen.game is game and len(game.step_times["show"]) < left:
+                    await pilot.pause(0.05)
+                count = min(left, *(len(v) for v in game.step_times.values()))
+                for stage, values in game.step_times.items():
+                    samples[stage].extend(list(values)[:count])
+            if screen is not None and screen in app.screen_stack:
+                await screen.delete_game()
+                app.pop_screen()
+            results.append(samples)
+    return results
+
+
+def format_table(results: dict[str, Stats], p: int = 50) -> str:
+    columns = [s for s in [*STAGES, "frame"] if any(s in r for r in results.values())]
+    width = max([len("map"), *(len(k) for k in results)])
+    lines = [
+        f"{'map':<{width}} "
+        + " ".join(f"{c:>8}" for c in columns)
+        + f"   (p{p} in µs, frame p99)"
+    ]
+    for key, stats in results.items():
+        cells = [f"{stats[c][f'p{p}']:>8}" if c in stats else f"{'-':>8}" for c in columns]
+        lines.append(
+            f"{key:<{width}} " + " ".join(cells) + f"   {stats['frame']['p99']}"
+        )
+    return "\n".join(lines)
+
+
+def compare(base: dict[str, Any], new: dict[str, Any], threshold: float) -> bool:
+    # Prints p50 change of every stage, returns True if anything got slower
+    if base.get("mode") != new.get("mode"):
+        # Stages of headless and app runs measure different things
+        raise ValueError(
+            f"Can not compare {base.get('mode')} results with {new.get('mode')} results"
+        )
+    regressed = False
+    for key, new_stats in new["maps"].items():
+        base_stats = base["maps"].get(key)
+        if base_stats is None:
+            print(f"{key}: not in base")
+            continue
+        changes: list[str] = []
+        for stage in [*STAGES, "frame"]:
+            if stage not in new_stats or stage not in base_stats:
+                continue
+            before = base_stats[stage]["p50"]
+            after = new_stats[stage]["p50"]
+            change = (after - before) / max(before, 1) * 100
+            mark = ""
+            # Few microseconds are within noise of the timer
+            if change > threshold and after - before >= MIN_DIFF_US:
+                mark = " !"
+                regressed = True
+            changes.append(f"{stage} {before}->{after} ({change:+.0f}%){mark}")
+        print(f"{key}: " + ", ".join(changes))
+    return regressed
+
+
+def run():
+    parser = argparse.ArgumentParser(prog="tofubyte-bench", description=__doc__)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument(
+        "--mode",
+        choices=["headless", "app"],
+        default="headless",
+        help="headless runs game rules only, app runs the real screen",
+    )
+    parser.add_argument("--maps", default="**/*", help="Glob inside tofu_byte/maps")
+    parser.add_argument(
+        "--replays", type=Path, help="Use newest <map>-*.replay from this folder"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of scripted input")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--json", action="store_true", help="Print JSON, no table")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "NEW"))
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Regression in percent"
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        base, new = (json.loads(p.read_text()) for p in args.compare)
+        try:
+            regressed = compare(base, new, args.threshold)
+        except ValueError as e:
+            parser.error(str(e))
+        sys.exit(1 if regressed else 0)
+
+    maps = find_maps(args.maps)
+    if not maps:
+        parser.error(f"No maps match {args.maps}")
+    replays = [replay_for(m, args.frames, args.seed, args.replays) for m in maps]
+
+    all_samples: list[Samples]
+    if args.mode == "app":
+        all_samples = asyncio.run(bench_app(replays, args.frames))
+    else:
+        all_samples = [bench_headless(replay, args.frames) for replay in replays]
+
+    results = {
+        map_key(m): summarize(s) for m, s in zip(maps, all_samples, strict=True)
+    }
+    report = {
+        "game_version": GAME_VERSION,
+        "mode": args.mode,
+        "frames": args.frames,
+        "seed": args.seed,
+        "maps": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_table(results))
+
+
+if __name__ == "__main__":
+    run()
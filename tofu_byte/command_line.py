@@ -2,20 +2,98 @@
 from __future__ import annotations
 
 import argparse
-from tofu_byte.main import GameMenu
-from tofu_byte.config import DEBUG
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from tofu_byte.config import DEBUG, set_setting
+
+if TYPE_CHECKING:
+    from textual.pilot import Pilot
+
+
+def profile_startup(limit: int = 25) -> None:
+    # Import times of a fresh interpreter, as reported by `-X importtime`
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import tofu_byte.main"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        # Import failed, its traceback is among the timings
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                print(line, file=sys.stderr)
+        sys.exit(result.returncode)
+    rows: list[tuple[int, int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append((int(cumulative), int(own), name.rstrip()))
+    total = sum(own for _, own, _ in rows)
+    print(f"Imports: {total / 1000:.1f} ms, slowest (cumulative / own ms):")
+    for cumulative, own, name in sorted(rows, reverse=True)[:limit]:
+        print(f"{cumulative / 1000:8.1f} {own / 1000:8.1f} {name}")
+
+    # Time until the menu is shown, without a terminal
+    start = perf_counter()
+    from tofu_byte.main import GameMenu
+
+    imported = perf_counter()
+
+    async def show_menu(pilot: Pilot[None]) -> None:
+        await pilot.pause()
+        shown = perf_counter()
+        print(f"App imported in {(imported - start) * 1000:.1f} ms")
+        print(f"Menu shown after {(shown - start) * 1000:.1f} ms")
+        pilot.app.exit()
+
+    GameMenu().run(headless=True, auto_pilot=show_menu)
 
 
 def run():
     parser = argparse.ArgumentParser()
     parser.add_argument("--debug", type=str)
+    parser.add_argument(
+        "--display",
+        choices=["widgets", "canvas"],
+        help="How the map is drawn, canvas is faster on big maps (remembered)",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        help="Play back a run recorded with --debug record",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print import times and time until the menu is shown",
+    )
     args = parser.parse_args()
+    if args.profile_startup:
+        profile_startup()
+        return
+    if args.display:
+        set_setting("display", args.display)
     # Add debug flags
     if args.debug:
         for x in args.debug.split(","):
             k, _, v = x.partition(":")
             DEBUG[k] = v or True
-    GameMenu().run()
+    from tofu_byte.game.replay import Replay
+    from tofu_byte.main import GameMenu
+
+    replay = None
+    if args.replay:
+        try:
+            replay = Replay.load(args.replay)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"Can not load replay {args.replay}: {e}")
+    GameMenu(replay).run()
 
 
 if __name__ == "__main__":
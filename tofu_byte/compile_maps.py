@@ -0,0 +1,50 @@
+"""Writes a compiled `.tmap` copy next to every JSON map.
+
+    tofubyte-compile-maps
+    tofubyte-compile-maps path/to/map.json path/to/maps_dir
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+from pathlib import Path
+
+from tofu_byte.config import PROJECT_DIR, user_dir
+from tofu_byte.objects.compiled_map import write_compiled_map
+
+
+def find_json(paths: list[Path]) -> list[Path]:
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.rglob("*.json")))
+        elif path.suffix == ".json":
+            files.append(path)
+    return files
+
+
+def run():
+    parser = argparse.ArgumentParser(prog="tofubyte-compile-maps", description=__doc__)
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Maps or folders with maps, bundled and user maps by default",
+    )
+    args = parser.parse_args()
+
+    paths = args.paths or [PROJECT_DIR / "maps", user_dir / "maps"]
+    compiled = 0
+    for file in find_json(paths):
+        try:
+            write_compiled_map(file)
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            print(f"Skipped {file}: {e}")
+            continue
+        compiled += 1
+    print(f"Compiled {compiled} maps")
+
+
+if __name__ == "__main__":
+    run()
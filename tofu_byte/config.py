@@ -1,6 +1,10 @@
+import atexit
 from collections import defaultdict
 import json
+import os
 from pathlib import Path
+from threading import RLock, Timer
+from typing import Any
 
 from platformdirs import user_config_dir, user_data_dir
 
@@ -11,8 +15,8 @@ GAME_VERSION = "0.1.1"
 APP_NAME = "TofuByte"
 APP_AUTHOR = "Cvaniak"
 
+# Folders inside are created when something is written there
 user_dir = Path(user_data_dir(APP_NAME, APP_AUTHOR))
-user_dir.mkdir(parents=True, exist_ok=True)
 
 
 CONFIG_DIR = Path(user_config_dir(APP_NAME, APP_AUTHOR))
@@ -36,50 +40,167 @@ RESOURCES_DIR = PROJECT_DIR / "resources"
 should_check_input_system = True
 
 
+_DELETED = object()
+
+
+class SettingsStore:
+    """Config file kept in memory, writes are saved in the background.
+
+    Writes are saved `delay` seconds after the last one, and on exit. The
+    file is read again when its mtime changes, changes that were not saved
+    yet are applied on top of it.
+    """
+
+    delay: float = 1.0
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        self.lock = RLock()
+        self.data: dict[str, Any] = {}
+        # Changes not saved yet, `_DELETED` for removed keys
+        self.pending: dict[str, Any] = {}
+        self.mtime_ns: int | None = None
+        self.timer: Timer | None = None
+        self.loaded = False
+
+    def _stat(self) -> int | None:
+        try:
+            return self.file.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _sync(self) -> None:
+        mtime_ns = self._stat()
+        if self.loaded and mtime_ns == self.mtime_ns:
+            return
+        data: dict[str, Any] = {}
+        if mtime_ns is not None:
+            try:
+                data = json.loads(self.file.read_text())
+            except (OSError, json.JSONDecodeError):
+                pass
+        for key, value in self.pending.items():
+            if value is _DELETED:
+                data.pop(key, None)
+            else:
+                data[key] = value
+        self.data = data
+        self.mtime_ns = mtime_ns
+        self.loaded = True
+
+    def _change(self, updates: dict[str, Any]) -> None:
+        self._sync()
+        for key, value in updates.items():
+            if value is _DELETED:
+                self.data.pop(key, None)
+            else:
+                self.data[key] = value
+        self.pending.update(updates)
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = Timer(self.delay, self.flush)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self.lock:
+            self._sync()
+            return self.data.get(key, default)
+
+    def has(self, key: str) -> bool:
+        with self.lock:
+            self._sync()
+            return key in self.data
+
+    def all(self) -> dict[str, Any]:
+        with self.lock:
+            self._sync()
+            return dict(self.data)
+
+    def set(self, key: str, value: Any) -> None:
+        with self.lock:
+            self._change({key: value})
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self._sync()
+            if key in self.data:
+                self._change({key: _DELETED})
+
+    def update(self, updates: dict[str, Any]) -> None:
+        with self.lock:
+            self._change(updates)
+
+    def replace(self, config: dict[str, Any]) -> None:
+        with self.lock:
+            self._sync()
+            removed = {key: _DELETED for key in self.data if key not in config}
+            self._change({**removed, **config})
+
+    def flush(self) -> None:
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.pending:
+                return
+            self._sync()
+            # Written next to the config and renamed, so it is never half saved
+            tmp = self.file.with_suffix(".json.tmp")
+            try:
+                self.file.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps(self.data, indent=2))
+                os.replace(tmp, self.file)
+            except OSError:
+                return
+            self.pending.clear()
+            self.mtime_ns = self._stat()
+
+    def reset(self) -> None:
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.pending.clear()
+            self.data = {}
+            self.file.unlink(missing_ok=True)
+            self.mtime_ns = None
+
+
+SETTINGS = SettingsStore(CONFIG_FILE)
+atexit.register(SETTINGS.flush)
+
+
 def load_config() -> dict:
-    if not CONFIG_FILE.exists():
-        return {}
-    try:
-        return json.loads(CONFIG_FILE.read_text())
-    except json.JSONDecodeError:
-        return {}
+    return SETTINGS.all()
 
 
 def save_config(config: dict) -> None:
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    CONFIG_FILE.write_text(json.dumps(config, indent=2))
+    SETTINGS.replace(config)
 
 
 def get_setting(key, default=None):
-    return load_config().get(key, default)
+    return SETTINGS.get(key, default)
 
 
 def set_setting(key, value) -> None:
-    config = load_config()
-    config[key] = value
-    save_config(config)
+    SETTINGS.set(key, value)
 
 
 def delete_setting(key) -> None:
-    config = load_config()
-    if key in config:
-        del config[key]
-        save_config(config)
+    SETTINGS.delete(key)
 
 
 def has_setting(key) -> bool:
-    return key in load_config()
+    return SETTINGS.has(key)
 
 
 def update_config(updates: dict) -> None:
-    config = load_config()
-    config.update(updates)
-    save_config(config)
+    SETTINGS.update(updates)
 
 
 def reset_config() -> None:
-    if CONFIG_FILE.exists():
-        CONFIG_FILE.unlink()
+    SETTINGS.reset()
 
 
 def load_from_config(obj, mapping: dict) -> None:
@@ -90,7 +211,4 @@ def load_from_config(obj, mapping: dict) -> None:
 
 
 def save_to_config(obj, mapping: dict) -> None:
-    config = load_config()
-    for attr, key in mapping.items():
-        config[key] = getattr(obj, attr)
-    save_config(config)
+    update_config({key: getattr(obj, attr) for attr, key in mapping.items()})
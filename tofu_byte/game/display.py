@@ -1,13 +1,43 @@
 from __future__ import annotations
 
+from bisect import insort
+from typing import Any, Iterable
+
+from rich.color import Color
+from rich.segment import Segment
+from rich.style import Style
+from rich.text import Text
 from textual import events
 from textual.app import ComposeResult
 from textual.containers import Container
-from textual.geometry import Size
+from textual.geometry import Offset, Region, Size
+from textual.strip import Strip
 from textual.widget import Widget
-from rich.color import Color
-from tofu_byte.game.events import DisplayClicked, DisplayMouseHover
+from tofu_byte.config import get_setting
+from tofu_byte.game.events import (
+    DisplayClicked,
+    DisplayMouseHover,
+    ObjectClicked,
+    ObjectMouseDown,
+    PlayerClicked,
+    PlayerMouseDown,
+)
 from tofu_byte.mystatic import GameObjectStatic
+from tofu_byte.objects.base_object import BaseObject, MouseState
+from tofu_byte.themes import palette_for
+
+
+LayerKey = tuple[int, int, str]
+
+
+def layer_key(drawable: GameObjectStatic) -> LayerKey:
+    # Layer names embed the number, it is compared as a number first, then
+    # by `layer_rank` so the order never depends on the names
+    return (
+        getattr(drawable, "layer_number", 0),
+        drawable.layer_rank,
+        drawable.styles.layer or "",
+    )
 
 
 class Display(Container):
@@ -23,6 +53,16 @@ class Display(Container):
     ) -> None:
         super().__init__(*children, name=name, id=id, classes=classes)
         self.drawables: list[GameObjectStatic] = []
+        # Region each drawable occupied when it was last painted
+        self.painted: dict[GameObjectStatic, Region] = {}
+        self.dirty_regions: list[Region] = []
+        self.cells_repainted = 0
+        # Drawables share one layer per layer number and type, the layers
+        # are kept sorted as drawables come and go
+        self.drawable_layers: dict[GameObjectStatic, LayerKey] = {}
+        self.layer_counts: dict[LayerKey, int] = {}
+        self.layer_order: list[LayerKey] = []
+        self.layers_changed = False
         self.can_focus = True
         self.screen_size = screen_size
         self.styles.min_width = self.styles.max_width = screen_size.width
@@ -31,34 +71,112 @@ class Display(Container):
         self.color = Color.parse(color)
         self.border_color = Color.parse(border_color)
 
+        self.palette = palette_for(self.app.current_theme)
         self.watch(self.app, "theme", self.on_theme_change, init=False)
 
+    def add_layer(self, drawable: GameObjectStatic) -> None:
+        key = layer_key(drawable)
+        self.drawable_layers[drawable] = key
+        count = self.layer_counts.get(key, 0)
+        self.layer_counts[key] = count + 1
+        if not count:
+            insort(self.layer_order, key)
+            self.layers_changed = True
+
+    def discard_layer(self, drawable: GameObjectStatic) -> None:
+        key = self.drawable_layers.pop(drawable, None)
+        if key is None:
+            return
+        self.layer_counts[key] -= 1
+        if not self.layer_counts[key]:
+            del self.layer_counts[key]
+            self.layer_order.remove(key)
+            self.layers_changed = True
+
+    def update_layer(self, drawable: GameObjectStatic) -> None:
+        # Called after the layer of a mounted drawable changed
+        key = layer_key(drawable)
+        if self.drawable_layers.get(drawable, key) == key:
+            return
+        self.discard_layer(drawable)
+        self.add_layer(drawable)
+        self.apply_layers()
+
+    def apply_layers(self) -> None:
+        if not self.layers_changed:
+            return
+        self.layers_changed = False
+        layers = [name for *_, name in self.layer_order]
+        self.screen.styles.layers = ("bg", *layers, "fg")
+
     def resort_layers(self):
-        layers = tuple(["bg", *sorted(x.layer for x in self.drawables), "fg"])
-        self.screen.styles.layers = layers
+        for drawable in self.drawables:
+            if self.drawable_layers.get(drawable) != layer_key(drawable):
+                self.discard_layer(drawable)
+                self.add_layer(drawable)
+        self.apply_layers()
 
     def compose(self) -> ComposeResult:
         yield from self.drawables
 
     def mount_drawable(self, drawable: GameObjectStatic) -> None:
-        self.drawables.append(drawable)
-        self.mount(drawable)
+        self.mount_drawables([drawable])
+
+    def mount_drawables(self, drawables: Iterable[GameObjectStatic]) -> None:
+        # Layers are sorted once for all of them
+        drawables = list(drawables)
+        for drawable in drawables:
+            drawable.set_palette(self.palette)
+            self.drawables.append(drawable)
+            self.painted[drawable] = Region()
+            self.add_layer(drawable)
+        if drawables:
+            self.mount(*drawables)
         self.is_draggin = False
         self.can_focus = False
-        self.resort_layers()
+        self.apply_layers()
 
     def delete_drawable(self, drawable: GameObjectStatic) -> None:
         self.drawables = [note for note in self.drawables if note != drawable]
-        self.remove_children([drawable])
+        self.invalidate(self.painted.pop(drawable, Region()))
         drawable.remove()
-        self.resort_layers()
+        self.discard_layer(drawable)
+        self.apply_layers()
 
     def clear_all(self):
-        to_remove = list(self.drawables)
-        self.remove_children(to_remove)
-        for drawable in list(to_remove):
-            drawable.remove()
+        # One removal for the whole map, like mount_drawables
+        self.remove_children(self.drawables)
         self.drawables = []
+        self.painted.clear()
+        self.drawable_layers.clear()
+        self.layer_counts.clear()
+        self.layer_order.clear()
+
+    def invalidate(self, region: Region) -> None:
+        region = region.intersection(Region(0, 0, *self.content_size))
+        if region.area:
+            self.dirty_regions.append(region)
+
+    def present(self, drawables: Iterable[GameObjectStatic] = ()) -> None:
+        for drawable in drawables:
+            painted = self.painted.get(drawable)
+            if painted is None:
+                # Already deleted
+                continue
+            region = drawable.canvas_region() if drawable.display else Region()
+            if not drawable.dirty and region == painted:
+                continue
+            drawable.dirty = False
+            self.painted[drawable] = region
+            if painted != region:
+                self.invalidate(painted)
+            self.invalidate(region)
+        self.cells_repainted = self.repaint(self.dirty_regions)
+        self.dirty_regions = []
+
+    def repaint(self, regions: list[Region]) -> int:
+        # Widgets repaint themselves, only count the cells
+        return sum(region.area for region in regions)
 
     async def on_mouse_down(self, event: events.MouseDown) -> None:
         self.post_message(DisplayClicked(event))
@@ -67,4 +185,247 @@ class Display(Container):
         self.post_message(DisplayMouseHover(event))
 
     def on_theme_change(self, new_value: str) -> None:
-        self.styles.background = self.app.available_themes[new_value].background
+        self.palette = palette_for(self.app.available_themes[new_value])
+        self.styles.background = self.palette.color("background")
+        for drawable in self.drawables:
+            drawable.set_palette(self.palette)
+
+
+REVERSE = Style(reverse=True)
+
+
+class CanvasDisplay(Display):
+    """Display that paints all drawables into one buffer with `render_line`.
+
+    Drawables are never mounted, so Textual composites a single widget
+    no matter how many objects the map has.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.paint_order: list[GameObjectStatic] = []
+        self.lines: list[Strip] | None = None
+        self.line_cache: dict[
+            GameObjectStatic, tuple[Text, Region, Style, list[Strip]]
+        ] = {}
+        self.hovered: GameObjectStatic | None = None
+        self.pressed: GameObjectStatic | None = None
+
+    def compose(self) -> ComposeResult:
+        yield from ()
+
+    def apply_layers(self) -> None:
+        # Same order as the widget layers, mount order within a layer
+        self.paint_order = sorted(self.drawables, key=lambda x: self.drawable_layers[x])
+        self.layers_changed = False
+        self.repaint_all()
+
+    def mount_drawables(self, drawables: Iterable[GameObjectStatic]) -> None:
+        drawables = list(drawables)
+        for drawable in drawables:
+            drawable.set_palette(self.palette)
+            drawable.canvas = self
+            self.drawables.append(drawable)
+            self.painted[drawable] = Region()
+            self.add_layer(drawable)
+        self.can_focus = False
+        if len(drawables) == 1:
+            insort(self.paint_order, drawables[0], key=lambda x: self.drawable_layers[x])
+            self.invalidate(drawables[0].canvas_region())
+        else:
+            self.apply_layers()
+
+    def delete_drawable(self, drawable: GameObjectStatic) -> None:
+        self.drawables = [note for note in self.drawables if note != drawable]
+        self.paint_order = [note for note in self.paint_order if note != drawable]
+        self.invalidate(self.painted.pop(drawable, Region()))
+        self.line_cache.pop(drawable, None)
+        self.discard_layer(drawable)
+
+    def clear_all(self):
+        self.drawables = []
+        self.painted.clear()
+        self.line_cache.clear()
+        self.drawable_layers.clear()
+        self.layer_counts.clear()
+        self.layer_order.clear()
+        self.hovered = self.pressed = None
+        self.apply_layers()
+
+    def repaint_all(self) -> None:
+        self.lines = None
+        self.refresh()
+
+    def invalidate(self, region: Region) -> None:
+        if not self.content_size.area:
+            # Not laid out, e.g. mounted again by a recompose of the editor
+            self.repaint_all()
+            return
+        super().invalidate(region)
+
+    def repaint(self, regions: list[Region]) -> int:
+        if self.lines is None:
+            # Whole buffer is painted again on the next render
+            return self.content_size.area
+        for region in regions:
+            self.repaint_region(region)
+            self.refresh(region.translate(self.content_offset))
+        return super().repaint(regions)
+
+    def get_drawable_at(self, offset: Offset) -> GameObjectStatic | None:
+        for drawable in reversed(self.paint_order):
+            if drawable.display and drawable.canvas_region().contains_point(offset):
+                return drawable
+        return None
+
+    def drawable_style(self, drawable: GameObjectStatic) -> Style:
+        style = drawable.palette_style
+        if drawable.has_class("focused_editable"):
+            style += self.palette.style(None, "accent")
+        elif drawable is self.hovered:
+            style += REVERSE
+        return style
+
+    def render_drawable(self, drawable: GameObjectStatic, region: Region) -> list[Strip]:
+        frame = drawable.curr_frame
+        style = self.drawable_style(drawable)
+        cached = self.line_cache.get(drawable)
+        if cached is not None:
+            c_frame, c_region, c_style, lines = cached
+            if c_frame is frame and c_region == region and c_style == style:
+                return lines
+
+        console = self.app.console
+        lines: list[Strip] = []
+        for line in frame.wrap(console, region.width, overflow="fold")[: region.height]:
+            line_style = style + console.get_style(line.style) if line.style else style
+            segments = Segment.apply_style(line.render(console), line_style)
+            lines.append(Strip(segments).adjust_cell_length(region.width, style))
+        lines.extend(
+            Strip.blank(region.width, style) for _ in range(region.height - len(lines))
+        )
+        self.line_cache[drawable] = (frame, region, style, lines)
+        return lines
+
+    def repaint_region(self, region: Region) -> None:
+        assert self.lines is not None
+        x, width = region.x, region.width
+        background = Style(bgcolor=self.rich_style.bgcolor)
+        rows = [Strip.blank(width, background) for _ in range(region.height)]
+
+        for drawable in self.paint_order:
+            if not drawable.display:
+                continue
+            drawable_region = drawable.canvas_region()
+            overlap = drawable_region.intersection(region)
+            if not overlap.area:
+                continue
+            strips = self.render_drawable(drawable, drawable_region)
+            start = overlap.x - drawable_region.x
+            for y in range(overlap.y, overlap.bottom):
+                strip = strips[y - drawable_region.y].crop(start, start + overlap.width)
+                row = rows[y - region.y]
+                rows[y - region.y] = Strip.join(
+                    [
+                        row.crop(0, overlap.x - x),
+                        strip,
+                        row.crop(overlap.right - x, width),
+                    ]
+                )
+
+        for y, row in enumerate(rows, region.y):
+            line = self.lines[y]
+            self.lines[y] = Strip.join(
+                [line.crop(0, x), row, line.crop(region.right, line.cell_length)]
+            )
+
+    def paint(self) -> list[Strip]:
+        width, height = self.content_size
+        background = Style(bgcolor=self.rich_style.bgcolor)
+        self.lines = [Strip.blank(width, background) for _ in range(height)]
+        self.repaint_region(Region(0, 0, width, height))
+        for drawable in self.drawables:
+            self.painted[drawable] = (
+                drawable.canvas_region() if drawable.display else Region()
+            )
+        return self.lines
+
+    def render_line(self, y: int) -> Strip:
+        if self.lines is None:
+            self.lines = self.paint()
+        if 0 <= y < len(self.lines):
+            return self.lines[y]
+        return Strip.blank(self.content_size.width, self.rich_style)
+
+    def on_resize(self, event: events.Resize) -> None:
+        self.repaint_all()
+
+    def on_theme_change(self, new_value: str) -> None:
+        super().on_theme_change(new_value)
+        self.line_cache.clear()
+        self.repaint_all()
+
+    # ===== Editor hit-testing =====
+
+    def editable_at(self, event: events.MouseEvent) -> GameObjectStatic | None:
+        if not self.has_class("editor"):
+            return None
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return None
+        drawable = self.get_drawable_at(offset)
+        if isinstance(drawable, BaseObject) and not drawable.editable:
+            return None
+        return drawable
+
+    async def on_mouse_down(self, event: events.MouseDown) -> None:
+        drawable = self.pressed = self.editable_at(event)
+        if drawable is None:
+            # Display.on_mouse_down reports click on empty space
+            return
+
+        event.prevent_default()
+        if self.app.mouse_captured is None:
+            self.capture_mouse()
+        event.stop()
+        drawable.mouse_state = MouseState.MOUSE_DOWN
+        if isinstance(drawable, BaseObject):
+            self.post_message(ObjectMouseDown(event, drawable))
+        else:
+            self.post_message(PlayerMouseDown(event, drawable))  # type: ignore
+
+    async def on_mouse_up(self, event: events.MouseUp) -> None:
+        self.capture_mouse(False)
+        drawable = self.pressed
+        if drawable is None:
+            return
+        if drawable.mouse_state == MouseState.MOUSE_DRAGGING:
+            drawable.mouse_state = MouseState.MOUSE_UP_AFTER_DRAGGING
+        else:
+            drawable.mouse_state = MouseState.NO_MOUSE
+
+    async def on_click(self, event: events.Click) -> None:
+        drawable = self.pressed
+        if drawable is None or drawable.mouse_state in [
+            MouseState.MOUSE_DRAGGING,
+            MouseState.MOUSE_UP_AFTER_DRAGGING,
+        ]:
+            return
+        if isinstance(drawable, BaseObject):
+            self.post_message(ObjectClicked(event, drawable))
+        else:
+            self.post_message(PlayerClicked(event, drawable))  # type: ignore
+
+    async def on_mouse_move(self, event: events.MouseMove) -> None:
+        hovered = self.editable_at(event)
+        if hovered is not self.hovered:
+            for drawable in (self.hovered, hovered):
+                if drawable is not None:
+                    drawable.mark_dirty()
+            self.hovered = hovered
+
+
+def create_display(**kwargs: Any) -> Display:
+    if get_setting("display") == "canvas":
+        return CanvasDisplay(**kwargs)
+    return Display(**kwargs)
@@ -88,5 +88,6 @@ class ObjectResized(Message):
 
 
 class LayerNumberChange(Message):
-    def __init__(self) -> None:
+    def __init__(self, object: BaseObject) -> None:
         super().__init__()
+        self.object = object
@@ -1,20 +1,27 @@
 from __future__ import annotations
 import asyncio
 from collections import defaultdict, deque
+from dataclasses import dataclass
 from pathlib import Path
-from time import perf_counter, time
+from time import perf_counter
 
 from textual.message_pump import MessagePump
 from textual._time import sleep as textual_sleep
 from tofu_byte.config import DEBUG
-from tofu_byte.objects.base_object import BaseObject
-
-from tofu_byte.objects.map import load_map
+from tofu_byte.game.ghost import Ghost, GhostTrace, load_best, save_if_best
+from tofu_byte.game.occupancy import OccupancyGrid
+from tofu_byte.game.replay import Replay, new_replay_path
+from tofu_byte.game.spatial_index import SpatialIndex
+from tofu_byte.objects.base_object import BaseObject, ObjectLogic
+from tofu_byte.mystatic import GameObjectStatic
+
+from tofu_byte.objects.map import MapConfigValues, load_map
 from tofu_byte.player.collision import Collision, CollisionEvent
-from tofu_byte.player.player import Player
+from tofu_byte.player.player import Player, PlayerLogic
 
 from typing import TYPE_CHECKING, Any
 
+from tofu_byte.tools.rng import run_random, seed_run
 from tofu_byte.tools.tools import Direction
 
 
@@ -25,7 +32,62 @@ TARGET_FPS = 30
 FRAME_BUDGET_US = 1_000_000 // TARGET_FPS
 
 
-class Scene(MessagePump):
+class SceneLogic:
+    """Game rules of a frame, shared by `Game` and `HeadlessScene`."""
+
+    objects: set[ObjectLogic | PlayerLogic]
+    colliders: set[ObjectLogic]
+    spatial_index: SpatialIndex
+    occupancy: OccupancyGrid | None
+    collision_logic: Collision
+    player: PlayerLogic
+
+    def update_clear_values(self):
+        for obj in self.objects:
+            obj.update_clear_values()
+
+    def check_collisions(self):
+        collisions: set[CollisionEvent] = self.collision_logic.gather_collisions(
+            self.player
+        )
+
+        blocked_axes: set[CollisionEvent] = set()
+
+        for event in collisions:
+            obj = event.obj
+
+            if obj.blocks_movement(event):
+                blocked_axes.add(event)
+
+            if obj.triggers:
+                obj.on_collision(event)
+
+        for event in blocked_axes:
+            self.player.on_collision(event)
+
+    def remove_objects(self) -> set[ObjectLogic | PlayerLogic]:
+        to_remove: set[ObjectLogic | PlayerLogic] = set()
+        for obj in self.objects:
+            if obj.should_remove:
+                to_remove.add(obj)
+
+        for i in to_remove:
+            self.objects.remove(i)
+            self.colliders.remove(i)
+            self.spatial_index.remove(i)
+            if self.occupancy is not None:
+                self.occupancy.remove(i)
+        return to_remove
+
+
+@dataclass
+class SceneSnapshot:
+    config: MapConfigValues
+    rng_state: tuple[Any, ...]
+    objects: list[tuple[BaseObject, Any]]
+
+
+class Scene(SceneLogic, MessagePump):
     object_editable: bool = False
 
     def __init__(
@@ -33,18 +95,25 @@ class Scene(MessagePump):
         mediator: GameScreenContainer,
         *args: Any,
         game_file: Path,
+        seed: int | None = None,
+        map_config: dict[Any, Any] | None = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(*args, **kwargs)
         self.mediator = mediator
         self.game_file: Path = game_file
+        # Objects draw their random effects from it while being created
+        self.seed = seed_run(seed)
 
         self.timers = []
         self.objects: set[BaseObject | Player] = set()
         self.colliders: set[BaseObject] = set()
+        self.spatial_index = SpatialIndex()
+        self.occupancy: OccupancyGrid | None = None
+        self.reloaded: list[GameObjectStatic] = []
         self.collision_logic = Collision(self)
 
-        self.load_map(self.game_file)
+        self.load_map(self.game_file, map_config)
         self.player: Player
         assert self.player
 
@@ -52,29 +121,77 @@ class Scene(MessagePump):
         self.timers = []
         self.objects: set[BaseObject | Player] = set()
         self.colliders: set[BaseObject] = set()
+        self.spatial_index = SpatialIndex()
+        self.occupancy = None
+        self.reloaded = []
         self.collision_logic = Collision(self)
 
-    def load_map(self, game_file: Path) -> None:
-        map_config = load_map(game_file)
-        self._add_loaded_objects(map_config.objects.objects)
+    def load_map(
+        self, game_file: Path, map_config: dict[Any, Any] | None = None
+    ) -> None:
+        map_data = load_map(game_file, map_config)
+        self._add_loaded_objects(map_data.objects.objects)
+
+        self.config = map_data.config
+        self.mediator.stats_clear(map_data.config)
+        self.map_size = map_data.config.map_size
+        self.map_name = map_data.metadata.name
+        self.authors = map_data.metadata.authors
+        self.map_game_version = map_data.metadata.game_version
+
+    def take_snapshot(self) -> SceneSnapshot:
+        # Taken after loading, restoring it restarts the map in place
+        return SceneSnapshot(
+            self.config,
+            run_random.getstate(),
+            [
+                (obj, obj.snapshot())
+                for obj in self.objects
+                if isinstance(obj, BaseObject)
+            ],
+        )
 
-        self.mediator.stats_clear(map_config.config)
-        self.map_name = map_config.metadata.name
-        self.authors = map_config.metadata.authors
-        self.map_game_version = map_config.metadata.game_version
+    def restore_snapshot(self, snapshot: SceneSnapshot) -> None:
+        # Removed widgets can not be mounted again, they are replaced by copies
+        copies = {
+            obj: obj.copy(size=obj.m_size)
+            for obj, _ in snapshot.objects
+            if obj not in self.objects
+        }
+        snapshot.objects = [
+            (copies.get(obj, obj), state) for obj, state in snapshot.objects
+        ]
+        self.mediator.mount_drawables(copies.values())
+        for obj in copies.values():
+            self.add_object_to_dicts(obj)
+            if self.occupancy is not None:
+                self.occupancy.add(obj)
+        for obj, state in snapshot.objects:
+            obj.restore(state)
+        self.player.reset()
+        # Copies drew new streams, objects got theirs back
+        run_random.setstate(snapshot.rng_state)
+        self.mediator.stats_clear(snapshot.config)
 
     def remove_object_from_dicts(self, object: BaseObject):
         self.colliders.discard(object)
+        self.spatial_index.remove(object)
         self.objects.discard(object)
 
     def add_object_to_dicts(self, object: BaseObject):
         if object.triggers or object.blocks:
             self.colliders.add(object)
+            self.spatial_index.add(object)
         self.objects.add(object)
 
+    def reindex_object(self, object: BaseObject | Player):
+        # Has to be called after object was moved or resized
+        if isinstance(object, BaseObject):
+            self.spatial_index.update(object)
+
     def _add_loaded_objects(self, objects: list[BaseObject | Player]) -> None:
+        self.mediator.mount_drawables(objects)
         for obj in objects:
-            self.mediator.mount_drawable(obj)
             self.objects.add(obj)
             if isinstance(obj, Player):
                 self.player: Player = obj
@@ -84,32 +201,26 @@ class Scene(MessagePump):
                 if self.object_editable:
                     obj.editable = True
                 self.colliders.add(obj)
+                self.spatial_index.add(obj)
+
+    def animate_objects(self) -> None:
+        for obj in self.objects:
+            if isinstance(obj, BaseObject) and obj.animated:
+                obj.advance_animation()
 
     def update_effects(self) -> None:
+        # Objects are only rendered again after they were marked dirty
+        self.reloaded = []
         for obj in self.objects:
             if not isinstance(obj, BaseObject):
                 continue
-            obj.reload()
-        self.player.change_color()
-
-    def check_collisions(self):
-        collisions: set[CollisionEvent] = self.collision_logic.gather_collisions(
-            self.player
-        )
-
-        blocked_axes: set[CollisionEvent] = set()
-
-        for event in collisions:
-            obj = event.obj
+            if obj.dirty:
+                obj.reload()
+                self.reloaded.append(obj)
 
-            if obj.blocks_movement(event):
-                blocked_axes.add(event)
-
-            if obj.triggers:
-                obj.on_collision(event)
-
-        for event in blocked_axes:
-            self.player.on_collision(event)
+    def present(self) -> None:
+        self.player.show()
+        self.mediator.present([*self.reloaded, self.player])
 
     async def update(self) -> None: ...
 
@@ -142,61 +253,73 @@ class Editor(Scene):
         ]
 
     async def update(self) -> None:
+        self.player.state.get_frame()
+        self.animate_objects()
         self.update_effects()
-        self.player.show()
+        self.present()
 
 
 class Game(Scene):
+    # Number of frames kept for the perf stats, None keeps all of them
+    perf_samples: int | None = 120
+    # Rendered frames that can be skipped to catch up with the game time,
+    # when it is even further behind the game slows down instead
+    max_frame_skip: int = 5
+
     def __init__(
         self,
         mediator: GameScreenContainer,
         *args: Any,
         game_file: Path,
         pause: bool = False,
+        seed: int | None = None,
+        record: bool = False,
+        ghost: bool = False,
         **kwargs: Any,
     ) -> None:
-        super().__init__(mediator, *args, game_file=game_file, **kwargs)
+        super().__init__(mediator, *args, game_file=game_file, seed=seed, **kwargs)
         self.run = not pause
+        self.run_once = False
+        self.replay = Replay(game_file, self.seed) if record else None
+        # Where the last run was saved
+        self.replay_file: Path | None = None
+        # Run is traced for the ghost of later attempts, shown when one won
+        self.trace: GhostTrace | None = None
+        self.ghost: Ghost | None = None
+        if ghost:
+            self.trace = GhostTrace(game_file, self.player.position)
+            best = load_best(game_file)
+            if best is not None:
+                self.ghost = Ghost(best, self.player.layer_number)
+                mediator.mount_drawable(self.ghost)
         self.is_reseting = False
-        if DEBUG["fps"]:
+        # Objects do not move during the game, so their tiles can be baked once
+        self.occupancy = OccupancyGrid.from_objects(self.colliders, self.map_size)
+        self.snapshot = self.take_snapshot()
+        self.profile = bool(DEBUG["fps"])
+        if self.profile:
             self.step_times: dict[str, deque[int]] = defaultdict(
-                lambda: deque(maxlen=120)
+                lambda: deque(maxlen=self.perf_samples)
             )
-            self.prev_time: int = round(time() * 1000)
-            self.times: deque[int] = deque(maxlen=30)
-            self.run_once = False
-            self.set_interval_task = asyncio.create_task(self.update_perf())
-        else:
-            self.set_interval_task = asyncio.create_task(self.update())
-
-    def update_clear_values(self):
-        for obj in self.objects:
-            obj.update_clear_values()
+            self.frame_times: defaultdict[str, int] = defaultdict(int)
+            self.prev_time = perf_counter()
+            self.times: deque[float] = deque(maxlen=30)
+            self.cells: deque[int] = deque(maxlen=30)
+        self.set_interval_task = asyncio.create_task(self.update())
 
     async def handle_input(self):
-        input_manager = self.mediator.input_manager
-        input_set: set[Direction] = set()
-        if input_manager.is_pressed(["a", "h", "left"]):
-            input_set.add("l")
-        if input_manager.is_pressed(["d", "l", "right"]):
-            input_set.add("r")
-        if input_manager.is_pressed(["k", "w", "space", "up"]):
-            input_set.add("u")
-        if input_manager.is_pressed(["j", "s", "down"]):
-            input_set.add("d")
+        input_set: set[Direction] = self.mediator.input_manager.poll()
+        if self.replay is not None:
+            self.replay.record(input_set)
 
         self.player.handle_input(input_set)
 
-    def remove_objects(self):
-        to_remove: set[BaseObject | Player] = set()
-        for obj in self.objects:
-            if obj.should_remove:
-                to_remove.add(obj)
-
-        for i in to_remove:
-            self.objects.remove(i)
-            self.colliders.remove(i)
-            self.mediator.delete_drawable(i)
+    def remove_objects(self) -> set[ObjectLogic | PlayerLogic]:
+        removed = super().remove_objects()
+        for obj in removed:
+            if isinstance(obj, BaseObject):
+                self.mediator.delete_drawable(obj)
+        return removed
 
     def pause_game(self):
         self.run = False
@@ -204,98 +327,130 @@ class Game(Scene):
     def resume_game(self) -> None:
         self.run = True
 
-    def end_game(self): ...
+    def save_replay(self) -> None:
+        if self.replay is not None and len(self.replay):
+            self.replay_file = new_replay_path(self.game_file)
+            self.replay.save(self.replay_file)
+
+    def end_game(self):
+        self.set_interval_task.cancel()
+        self.save_replay()
+        self.replay = None
+
+    def restart(self) -> None:
+        # Same as loading the map again with the same seed
+        self.restore_snapshot(self.snapshot)
+        if self.replay is not None:
+            self.save_replay()
+            self.replay = Replay(self.game_file, self.seed)
+        if self.trace is not None:
+            self.trace = GhostTrace(self.game_file, self.player.position)
+        if self.ghost is not None:
+            self.ghost.rewind()
+
+    def save_ghost(self) -> bool:
+        # Called after a won run, kept when it is the fastest one
+        if self.trace is None or not len(self.trace):
+            return False
+        return save_if_best(self.trace)
+
+    def present(self) -> None:
+        if self.ghost is not None:
+            self.ghost.show()
+            self.reloaded.append(self.ghost)
+        super().present()
 
     def single_step(self):
         if DEBUG["step"]:
             self.run_once = True
 
-    async def update(self) -> None:
-        target_frame_time = 1 / TARGET_FPS
-        next_frame_time = perf_counter()
-
-        while True:
-            if not self.run:
-                await textual_sleep(0.1)
-                continue
-            now = perf_counter()
-            sleep_time = next_frame_time - now
-            if sleep_time > 0:
-                await textual_sleep(sleep_time)
-
-            self.update_clear_values()
-            await self.handle_input()
-            self.check_collisions()
-            self.player.update_states()
-            self.remove_objects()
-            self.mediator.update()
-            self.update_effects()
-            self.player.show()
-
-            next_frame_time += target_frame_time
-
     def _probe(self, name: str, start: float) -> float:
+        if not self.profile:
+            return start
         now = perf_counter()
-        self.step_times[name].append(int((now - start) * 1000000))
+        self.frame_times[name] += int((now - start) * 1000000)
         return now
 
-    async def update_perf(self) -> None:
-        target_frame_time = 1 / TARGET_FPS
-        next_frame_time = perf_counter()
+    async def tick(self) -> None:
+        t = perf_counter()
+        self.update_clear_values()
+        t = self._probe("clear", t)
+        await self.handle_input()
+        t = self._probe("input", t)
+        self.check_collisions()
+        t = self._probe("coll", t)
+        self.player.update_states()
+        t = self._probe("states", t)
+        # Animations advance with the game time, so replays look the same
+        self.animate_objects()
+        t = self._probe("effects", t)
+        self.remove_objects()
+        # States count frames while being shown, transitions depend on it
+        self.player.state.get_frame()
+        if self.trace is not None:
+            state = self.player.state
+            self.trace.record(self.player.position, state.animation[state.shown])
+        if self.ghost is not None:
+            self.ghost.advance()
+        self._probe("remove", t)
+
+    def render_frame(self) -> None:
+        t = perf_counter()
+        self.mediator.update()
+        t = self._probe("med", t)
+        self.update_effects()
+        self.present()
+        self._probe("show", t)
+
+    async def update(self) -> None:
+        tick_time = 1 / TARGET_FPS
+        next_tick = perf_counter()
 
         while True:
-            if not self.run and not (DEBUG["step"] and self.run_once):
+            if not self.run and not self.run_once:
                 await textual_sleep(0.1)
+                next_tick = perf_counter()
                 continue
-            now = perf_counter()
-            sleep_time = next_frame_time - now
-            if sleep_time > 0:
-                await textual_sleep(sleep_time)
-
+            # Sleeps even when late, Textual has to get time to paint
+            await textual_sleep(max(next_tick - perf_counter(), 0))
             frame_start = perf_counter()
-            t = frame_start
-
-            self.update_clear_values()
-            t = self._probe("clear", t)
 
-            await self.handle_input()
-            t = self._probe("input", t)
-
-            self.check_collisions()
-            t = self._probe("coll", t)
-
-            self.player.update_states()
-            t = self._probe("states", t)
-
-            self.update_effects()
-            t = self._probe("effects", t)
-
-            self.remove_objects()
-            t = self._probe("remove", t)
-
-            self.mediator.update()
-            t = self._probe("med", t)
-
-            self.player.show()
-            t = self._probe("show", t)
-
-            if DEBUG["fps"] and self.step_times:
-                avg_us = {k: sum(v) // len(v) for k, v in self.step_times.items()}
-
-                frame_time_us = int((perf_counter() - frame_start) * 1_000_000)
-                remaining_us = FRAME_BUDGET_US - frame_time_us
+            ticks = 0
+            while True:
+                await self.tick()
+                next_tick += tick_time
+                ticks += 1
+                if self.run_once or next_tick > perf_counter():
+                    break
+                if ticks > self.max_frame_skip:
+                    next_tick = perf_counter()
+                    break
+            self.render_frame()
+
+            if self.profile:
+                self.show_perf(frame_start, ticks)
+            self.run_once = False
 
-                _time: int = perf_counter() * 1_000_000
-                self.times.append(_time - self.prev_time)
-                self.prev_time = _time
-                mid = sum(self.times) // len(self.times)
+    def show_perf(self, frame_start: float, ticks: int) -> None:
+        for name, value in self.frame_times.items():
+            self.step_times[name].append(value)
+        self.frame_times.clear()
+        self.cells.append(self.mediator.game_display.cells_repainted)
 
-                self.mediator.footer.fps.update(
-                    " | ".join(f"{k}:{v:<5}µs" for k, v in avg_us.items())
-                    + f" || frame:{frame_time_us:<5}µs"
-                    + f" || headroom:{remaining_us:<5}µs"
-                    + f" || fps:{1_000_000 / mid:.3f}"
-                )
+        avg_us = {k: sum(v) // len(v) for k, v in self.step_times.items()}
+        frame_time_us = int((perf_counter() - frame_start) * 1_000_000)
+        remaining_us = FRAME_BUDGET_US - frame_time_us
 
-            self.run_once = False
-            next_frame_time += target_frame_time
+        now = perf_counter()
+        self.times.append(now - self.prev_time)
+        self.prev_time = now
+        mid = sum(self.times) / len(self.times)
+
+        self.mediator.footer.fps.update(
+            " | ".join(f"{k}:{v:<5}µs" for k, v in avg_us.items())
+            + f" || frame:{frame_time_us:<5}µs"
+            + f" || headroom:{remaining_us:<5}µs"
+            + f" || cells:{sum(self.cells) // len(self.cells):<5}"
+            + f" || ticks:{ticks}"
+            + f" || fps:{1 / mid:.3f}"
+        )
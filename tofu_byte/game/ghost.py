@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from rich.style import Style
+from textual.geometry import Offset
+
+from tofu_byte.config import GAME_VERSION, user_dir
+from tofu_byte.mystatic import GameObjectStatic, MyText
+from tofu_byte.objects.faze import styled_frames
+from tofu_byte.objects.map import map_hash, map_key
+from tofu_byte.themes import Palette
+
+GHOSTS_DIR = user_dir / "ghosts"
+GHOST_VERSION = 2
+
+# How much of the background shows through the ghost
+GHOST_FADE = 0.6
+
+
+def ghost_path(map_file: Path) -> Path:
+    # Maps in different folders can share a name
+    key = map_key(map_file)
+    return GHOSTS_DIR / f"{map_file.stem}-{zlib.crc32(key.encode()):08x}.ghost"
+
+
+def parse_header(line: str) -> dict[str, Any]:
+    header = json.loads(line)
+    if header.get("version") != GHOST_VERSION:
+        raise ValueError(f"Unsupported ghost version: {header.get('version')}")
+    return header
+
+
+def read_header(path: Path) -> dict[str, Any]:
+    # Only the first line, e.g. to compare with a new run
+    with path.open(encoding="utf-8") as f:
+        return parse_header(f.readline())
+
+
+@dataclass
+class GhostTrace:
+    """Position and shown glyph of the player in every frame of a run.
+
+    Frames are appended while playing: the move from the frame before as a
+    signed byte per axis and the index of the glyph in `glyphs`. The file
+    starts with a JSON header line, every next line is
+    `<number of frames> <dx> <dy> <glyph index>`.
+    """
+
+    map_file: Path
+    start: Offset
+    glyphs: list[str] = field(default_factory=list)
+    moves: array[int] = field(default_factory=lambda: array("b"))
+    shown: array[int] = field(default_factory=lambda: array("B"))
+
+    def __post_init__(self) -> None:
+        self.glyph_ids = {glyph: i for i, glyph in enumerate(self.glyphs)}
+        self.last = self.start
+
+    def __len__(self) -> int:
+        return len(self.shown)
+
+    def record(self, offset: Offset, glyph: str) -> None:
+        last = self.last
+        self.moves.append(offset.x - last.x)
+        self.moves.append(offset.y - last.y)
+        self.last = offset
+        glyph_id = self.glyph_ids.get(glyph)
+        if glyph_id is None:
+            glyph_id = self.glyph_ids[glyph] = len(self.glyphs)
+            self.glyphs.append(glyph)
+        self.shown.append(glyph_id)
+
+    def runs(self) -> list[tuple[int, int, int, int]]:
+        runs: list[tuple[int, int, int, int]] = []
+        moves = self.moves
+        for i, glyph_id in enumerate(self.shown):
+            frame = (moves[2 * i], moves[2 * i + 1], glyph_id)
+            if runs and runs[-1][1:] == frame:
+                runs[-1] = (runs[-1][0] + 1, *frame)
+            else:
+                runs.append((1, *frame))
+        return runs
+
+    def save(self, path: Path) -> None:
+        header = {
+            "version": GHOST_VERSION,
+            "game_version": GAME_VERSION,
+            "map": map_key(self.map_file),
+            "map_hash": map_hash(self.map_file),
+            "frames": len(self),
+            "start": [self.start.x, self.start.y],
+            "glyphs": self.glyphs,
+        }
+        lines = [json.dumps(header, ensure_ascii=False)]
+        lines.extend(" ".join(map(str, run)) for run in self.runs())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path, map_file: Path) -> GhostTrace:
+        header_line, *lines = path.read_text(encoding="utf-8").splitlines()
+        header = parse_header(header_line)
+        trace = cls(map_file, Offset(*header["start"]), header["glyphs"])
+        for line in lines:
+            if not line.strip():
+                continue
+            count, dx, dy, glyph_id = map(int, line.split())
+            trace.moves.extend((dx, dy) * count)
+            trace.shown.extend((glyph_id,) * count)
+        return trace
+
+
+def load_best(map_file: Path) -> GhostTrace | None:
+    # Runs of an older version of the map are of no use
+    path = ghost_path(map_file)
+    try:
+        if not path.exists():
+            return None
+        header = read_header(path)
+        if header["map_hash"] != map_hash(map_file):
+            return None
+        return GhostTrace.load(path, map_file)
+    except (OSError, ValueError, KeyError, TypeError, OverflowError):
+        return None
+
+
+def save_if_best(trace: GhostTrace) -> bool:
+    # Fastest run is the one with the fewest frames
+    path = ghost_path(trace.map_file)
+    try:
+        if path.exists():
+            header = read_header(path)
+            if (
+                header["map_hash"] == map_hash(trace.map_file)
+                and header["frames"] <= len(trace)
+            ):
+                return False
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    try:
+        trace.save(path)
+    except OSError:
+        return False
+    return True
+
+
+class Ghost(GameObjectStatic):
+    """Player of the best run, played back from its trace."""
+
+    frame_style: Style = Style()
+    # Below the player and objects of the same layer number
+    layer_rank: int = -1
+
+    def __init__(self, trace: GhostTrace, layer_number: int = 2) -> None:
+        super().__init__()
+        self.trace = trace
+        self.layer_number = layer_number
+        self.styles.layer = f"a{layer_number}Ghost"
+        self.glyphs = tuple(trace.glyphs)
+        self.curr_frame = MyText()
+        self.rewind()
+
+    def rewind(self) -> None:
+        self.index = 0
+        self.offset = self.trace.start
+        self.display = False
+
+    def set_palette(self, palette: Palette) -> None:
+        super().set_palette(palette)
+        background = palette.color("background")
+        self.frame_style = Style(
+            color=palette.color("player-color").blend(background, GHOST_FADE).rich_color,
+            bgcolor=background.rich_color,
+        )
+
+    def advance(self) -> None:
+        # Called once per game frame, the ghost is gone after its last one
+        i = self.index
+        if i >= len(self.trace):
+            if self.display:
+                self.display = False
+            return
+        dx = self.trace.moves[2 * i]
+        dy = self.trace.moves[2 * i + 1]
+        if dx or dy:
+            self.offset = self.offset + Offset(dx, dy)
+        if not i:
+            self.display = True
+        self.index = i + 1
+
+    def show(self) -> None:
+        if not self.index:
+            return
+        frame = styled_frames(self.glyphs, self.frame_style)[
+            self.trace.shown[self.index - 1]
+        ]
+        if self.curr_frame is not frame:
+            self.show_frame(frame)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable
+
+from textual.message import Message
+
+from tofu_byte.game.events import EndGame, HpChange, PointCollected
+from tofu_byte.game.game import SceneLogic
+from tofu_byte.game.models import MODEL_REGISTRY, ObjectModel, PlayerModel
+from tofu_byte.game.occupancy import OccupancyGrid
+from tofu_byte.game.spatial_index import SpatialIndex
+from tofu_byte.objects.map import load_config_values, read_map
+from tofu_byte.player.collision import Collision
+from tofu_byte.tools.tools import Direction
+
+
+class HeadlessScene(SceneLogic):
+    """Runs the game rules of a map on plain models, without app or widgets.
+
+    `inputs` yields pressed directions for each frame, once it is exhausted
+    the player gets no input.
+    """
+
+    def __init__(
+        self, game_file: Path, inputs: Iterable[Iterable[Direction]] = ()
+    ) -> None:
+        self.game_file = game_file
+        self.inputs = iter(inputs)
+        self.objects: set[ObjectModel | PlayerModel] = set()
+        self.colliders: set[ObjectModel] = set()
+        self.spatial_index = SpatialIndex()
+        self.collision_logic = Collision(self)
+        self.messages: list[Message] = []
+        self.step_times: defaultdict[str, list[int]] = defaultdict(list)
+
+        self.frame = 0
+        self.won: bool | None = None
+        self.load_map(game_file)
+        self.occupancy = OccupancyGrid.from_objects(self.colliders, self.map_size)
+
+    def load_map(self, game_file: Path) -> None:
+        map_config = read_map(game_file)
+        config = load_config_values(map_config)
+        self.hp = config.hp
+        self.points = 0
+        self.max_points = config.points
+        self.winning_ball = config.winning_ball
+        self.map_size = config.map_size
+
+        for data in map_config["objects"]:
+            obj = MODEL_REGISTRY[data["type"]].from_json(data)
+            obj.outbox = self.messages
+            self.objects.add(obj)
+            if isinstance(obj, PlayerModel):
+                self.player: PlayerModel = obj
+            else:
+                self.colliders.add(obj)
+                self.spatial_index.add(obj)
+
+    @property
+    def finished(self) -> bool:
+        return self.won is not None
+
+    def handle_input(self, directions: Iterable[Direction] | None = None) -> None:
+        if directions is None:
+            directions = next(self.inputs, ())
+        self.player.handle_input(set(directions))
+
+    def handle_messages(self) -> None:
+        # Same rules as GameScreenContainer applies to the messages
+        for message in self.messages:
+            if isinstance(message, PointCollected):
+                self.points += message.val
+                if self.points >= self.max_points and not self.winning_ball:
+                    self.won = True
+            elif isinstance(message, HpChange):
+                self.hp += message.val
+            elif isinstance(message, EndGame):
+                if message.won:
+                    self.won = True
+                elif self.hp <= 0:
+                    self.won = False
+        self.messages.clear()
+
+    def tick(self, directions: Iterable[Direction] | None = None) -> None:
+        self.update_clear_values()
+        self.handle_input(directions)
+        self.check_collisions()
+        self.player.update_states()
+        self.remove_objects()
+        # States count frames while being shown, transitions depend on it
+        self.player.state.get_frame()
+        self.handle_messages()
+        self.frame += 1
+
+    def _probe(self, name: str, start: float) -> float:
+        now = perf_counter()
+        self.step_times[name].append(int((now - start) * 1000000))
+        return now
+
+    def tick_perf(self, directions: Iterable[Direction] | None = None) -> None:
+        # Same as `tick`, but collects time of each stage in `step_times`
+        # Models have no animations, so there is no "effects" stage of `Game`
+        t = perf_counter()
+        self.update_clear_values()
+        t = self._probe("clear", t)
+        self.handle_input(directions)
+        t = self._probe("input", t)
+        self.check_collisions()
+        t = self._probe("coll", t)
+        self.player.update_states()
+        t = self._probe("states", t)
+        self.remove_objects()
+        t = self._probe("remove", t)
+        self.player.state.get_frame()
+        t = self._probe("advance", t)
+        self.handle_messages()
+        self._probe("messages", t)
+        self.frame += 1
+
+    def run(self, max_frames: int) -> bool | None:
+        while not self.finished and self.frame < max_frames:
+            self.tick()
+        return self.won
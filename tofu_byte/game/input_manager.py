@@ -1,10 +1,57 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List
+from collections.abc import Mapping
+from typing import Any, cast
+
+from tofu_byte.config import get_setting
+from tofu_byte.tools.tools import Direction
+
+DEFAULT_KEYBINDINGS: dict[Direction, list[str]] = {
+    "l": ["a", "h", "left"],
+    "r": ["d", "l", "right"],
+    "u": ["k", "w", "space", "up"],
+    "d": ["j", "s", "down"],
+}
+
+# Held directions are published as a bitmask, one bit for each direction
+DIRECTION_BITS: dict[Direction, int] = {"l": 1, "r": 2, "u": 4, "d": 8}
+MASK_DIRECTIONS: list[frozenset[Direction]] = [
+    frozenset(d for d, bit in DIRECTION_BITS.items() if mask & bit)
+    for mask in range(1 << len(DIRECTION_BITS))
+]
+
+
+def load_keybindings(
+    overrides: Mapping[str, Any] | None = None,
+) -> dict[Direction, list[str]]:
+    # `keybindings` setting replaces the keys of the directions it lists
+    if overrides is None:
+        overrides = get_setting("keybindings", {}) or {}
+    keybindings = dict(DEFAULT_KEYBINDINGS)
+    for direction, keys in overrides.items():
+        if direction in DIRECTION_BITS and isinstance(keys, list):
+            keybindings[cast(Direction, direction)] = [str(k) for k in keys]
+    return keybindings
+
+
+def key_masks(keybindings: Mapping[Direction, list[str]]) -> dict[str, int]:
+    masks: dict[str, int] = {}
+    for direction, keys in keybindings.items():
+        for key in keys:
+            masks[key] = masks.get(key, 0) | DIRECTION_BITS[direction]
+    return masks
 
 
 class InputManager(ABC):
+    # Reads the keyboard outside of the terminal, it may need permissions
+    global_hook: bool = False
+
+    def __init__(self) -> None:
+        # Read for every game, so changed bindings apply to the next one
+        self.keybindings = load_keybindings()
+        self.key_masks = key_masks(self.keybindings)
+
     @abstractmethod
     def start(self) -> None:
         raise NotImplementedError
@@ -14,12 +61,44 @@ class InputManager(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def is_pressed(self, key_names: List[str]) -> bool:
+    def is_pressed(self, key_names: list[str]) -> bool:
         raise NotImplementedError
 
+    def snapshot(self) -> int:
+        # Bitmask of held directions, see `DIRECTION_BITS`
+        mask = 0
+        for direction, keys in self.keybindings.items():
+            if self.is_pressed(keys):
+                mask |= DIRECTION_BITS[direction]
+        return mask
+
+    def poll(self) -> set[Direction]:
+        # Directions held in the current frame, called once per game frame
+        return set(MASK_DIRECTIONS[self.snapshot()])
+
+
+# Set when pynput did not see the keys, terminal input is used from then on
+pynput_failed = False
+
 
 def create_input_manager() -> InputManager:
-    # It looked that pynput does not work with Windows but it seems to work now.
-    from .unix_input_manager import UnixInputManager
+    # `input` setting can force "terminal" or "pynput"
+    if get_setting("input") != "terminal" and not pynput_failed:
+        try:
+            # It looked that pynput does not work with Windows but it seems to work now.
+            from .unix_input_manager import UnixInputManager
+
+            return UnixInputManager()
+        except ImportError:
+            # pynput has no backend, e.g. over SSH without X server
+            if get_setting("input") == "pynput":
+                raise
+    from .terminal_input_manager import TerminalInputManager
+
+    return TerminalInputManager()
+
 
-    return UnixInputManager()
+def fall_back_to_terminal() -> InputManager:
+    global pynput_failed
+    pynput_failed = True
+    return create_input_manager()
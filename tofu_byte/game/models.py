@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import Any
+
+from textual.geometry import Offset, Size
+from textual.message import Message
+
+from tofu_byte.objects.base_object import ObjectLogic
+from tofu_byte.objects.floating_text import TextLogic
+from tofu_byte.objects.floor import FloorLogic
+from tofu_byte.objects.killing_boundary import KillingBondaryLogic
+from tofu_byte.objects.light import LightLogic
+from tofu_byte.objects.spikes import SpikesDownLogic, SpikesLogic
+from tofu_byte.objects.stars import EndBallLogic, StarLogic
+from tofu_byte.player.player import PlayerLogic
+
+
+class Model:
+    """Plain counterpart of a game widget, posted messages land in `outbox`."""
+
+    type_name = "Undefined"
+
+    def __init__(self) -> None:
+        self.should_remove = False
+        self.outbox: list[Message] = []
+
+    def post_message(self, message: Message) -> bool:
+        self.outbox.append(message)
+        return True
+
+
+class ObjectModel(Model, ObjectLogic):
+    def __init__(
+        self,
+        pos: Offset | None = None,
+        size: Size | None = None,
+        layer_number: int = 1,
+    ) -> None:
+        super().__init__()
+        self.pos = Offset(0, 0) if pos is None else pos
+        self.m_size = self.validate_m_size(Size(1, 1) if size is None else size)
+        self.layer_number = layer_number
+        self.last_collision_event = None
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> ObjectModel:
+        layer_number = data.get("layer_number", 1)
+        return cls(Offset(*data["pos"]), Size(*data["size"]), layer_number)
+
+
+class FloorModel(FloorLogic, ObjectModel):
+    type_name = "Floor"
+
+
+class SpikesModel(SpikesLogic, ObjectModel):
+    type_name = "Spikes"
+
+
+class SpikesDownModel(SpikesDownLogic, ObjectModel):
+    type_name = "SpikesDown"
+
+
+class LightModel(LightLogic, ObjectModel):
+    type_name = "Light"
+
+
+class StarModel(StarLogic, ObjectModel):
+    type_name = "Star"
+
+
+class EndBallModel(EndBallLogic, ObjectModel):
+    type_name = "EndBall"
+
+
+class TextModel(TextLogic, ObjectModel):
+    type_name = "Text"
+
+
+class KillingBondaryModel(KillingBondaryLogic, ObjectModel):
+    type_name = "KillingBondary"
+
+
+class PlayerModel(Model, PlayerLogic):
+    type_name = "Player"
+
+    def __init__(self, start_pos: Offset | None = None, layer_number: int = 2):
+        super().__init__()
+        if start_pos is None:
+            start_pos = Offset(1, 1)
+        self.layer_number = layer_number
+        self.starting_pos = start_pos
+        self.set_player(start_pos)
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> PlayerModel:
+        layer_number = data.get("layer_number", 1)
+        return cls(Offset(*data["pos"]), layer_number=layer_number)
+
+
+MODEL_REGISTRY: dict[str, type[ObjectModel | PlayerModel]] = {
+    model.type_name: model
+    for model in (
+        FloorModel,
+        SpikesModel,
+        SpikesDownModel,
+        LightModel,
+        StarModel,
+        EndBallModel,
+        TextModel,
+        KillingBondaryModel,
+        PlayerModel,
+    )
+}
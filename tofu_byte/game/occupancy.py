@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING
+
+from textual.geometry import Offset
+
+if TYPE_CHECKING:
+    from tofu_byte.objects.base_object import ObjectLogic
+
+
+# Some object occupies the cell, so collision probes need no bounds checks
+OCCUPIED = 1
+# More than one object owns the cell, owners are kept in `OccupancyGrid.shared`
+SHARED = 2
+
+
+class OccupancyGrid:
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.flags = bytearray(width * height)
+        # Index + 1 of the owning object in `self.objects`, 0 means empty cell
+        self.owners = array("I", bytes(4 * width * height))
+        self.shared: dict[int, list[ObjectLogic]] = {}
+        self.objects: list[ObjectLogic | None] = []
+        # Index of every object in `self.objects`
+        self.slots: dict[ObjectLogic, int] = {}
+        self.object_cells: dict[ObjectLogic, list[int]] = {}
+        self.unbounded: list[ObjectLogic] = []
+
+    @classmethod
+    def from_objects(
+        cls, objects: Iterable[ObjectLogic], map_size: Offset
+    ) -> OccupancyGrid:
+        grid = cls(map_size.x, map_size.y)
+        for obj in objects:
+            grid.add(obj)
+        return grid
+
+    def covers(self, pos: Offset) -> bool:
+        return 0 <= pos.x < self.width and 0 <= pos.y < self.height
+
+    def add(self, obj: ObjectLogic) -> None:
+        region = obj.collision_region()
+        if region is None:
+            self.unbounded.append(obj)
+            return
+
+        self.slots[obj] = len(self.objects)
+        self.objects.append(obj)
+        owner = len(self.objects)
+        cells: list[int] = []
+        for y in range(max(region.y, 0), min(region.bottom, self.height)):
+            for x in range(max(region.x, 0), min(region.right, self.width)):
+                pos = Offset(x, y)
+                if not obj.occupies_tile(pos):
+                    continue
+                cell = y * self.width + x
+                cells.append(cell)
+                current = self.owners[cell]
+                if current == 0:
+                    self.owners[cell] = owner
+                    self.flags[cell] = OCCUPIED
+                    continue
+                if not self.flags[cell] & SHARED:
+                    first = self.objects[current - 1]
+                    assert first is not None
+                    self.shared[cell] = [first]
+                self.shared[cell].append(obj)
+                self.flags[cell] = OCCUPIED | SHARED
+        self.object_cells[obj] = cells
+
+    def remove(self, obj: ObjectLogic) -> None:
+        if obj in self.unbounded:
+            self.unbounded.remove(obj)
+            return
+        cells = self.object_cells.pop(obj, None)
+        if cells is None:
+            return
+
+        self.objects[self.slots.pop(obj)] = None
+        for cell in cells:
+            if not self.flags[cell] & SHARED:
+                self.owners[cell] = 0
+                self.flags[cell] = 0
+                continue
+
+            owners = self.shared[cell]
+            owners.remove(obj)
+            if len(owners) == 1:
+                del self.shared[cell]
+                self.owners[cell] = self.slots[owners[0]] + 1
+                self.flags[cell] = OCCUPIED
+
+    def owners_at(self, pos: Offset) -> Sequence[ObjectLogic]:
+        # Every owner occupies the cell, unbounded objects are not included
+        cell = pos.y * self.width + pos.x
+        flags = self.flags[cell]
+        if not flags:
+            return ()
+        if flags & SHARED:
+            return self.shared[cell]
+        obj = self.objects[self.owners[cell] - 1]
+        assert obj is not None
+        return (obj,)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import strftime
+from typing import cast
+
+from tofu_byte.config import GAME_VERSION, PROJECT_DIR, user_dir
+from tofu_byte.game.input_manager import InputManager
+from tofu_byte.tools.tools import Direction
+
+REPLAYS_DIR = user_dir / "replays"
+REPLAY_VERSION = 1
+
+# Directions of a frame are written in this order, "-" means no input
+DIRECTION_ORDER: list[Direction] = ["l", "r", "u", "d"]
+NO_INPUT = "-"
+
+
+def encode_directions(directions: frozenset[Direction]) -> str:
+    return "".join(d for d in DIRECTION_ORDER if d in directions) or NO_INPUT
+
+
+def decode_directions(text: str) -> frozenset[Direction]:
+    if text == NO_INPUT:
+        return frozenset()
+    if any(d not in DIRECTION_ORDER for d in text):
+        raise ValueError(f"Unknown direction in replay: {text!r}")
+    return frozenset(cast(Direction, d) for d in text)
+
+
+@dataclass
+class Replay:
+    """Per frame input of a single run, stored run-length encoded.
+
+    The file starts with a JSON header line, every next line is
+    `<number of frames> <directions>`.
+    """
+
+    map_file: Path
+    seed: int
+    runs: list[tuple[int, frozenset[Direction]]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return sum(count for count, _ in self.runs)
+
+    def record(self, directions: set[Direction]) -> None:
+        frame = frozenset(directions)
+        if self.runs and self.runs[-1][1] == frame:
+            self.runs[-1] = (self.runs[-1][0] + 1, frame)
+        else:
+            self.runs.append((1, frame))
+
+    def frames(self) -> Iterator[frozenset[Direction]]:
+        for count, directions in self.runs:
+            for _ in range(count):
+                yield directions
+
+    def save(self, path: Path) -> None:
+        map_file = self.map_file.resolve()
+        if map_file.is_relative_to(PROJECT_DIR):
+            map_file = map_file.relative_to(PROJECT_DIR)
+        header = {
+            "version": REPLAY_VERSION,
+            "game_version": GAME_VERSION,
+            "map": map_file.as_posix(),
+            "seed": self.seed,
+            "frames": len(self),
+        }
+        lines = [json.dumps(header)]
+        lines.extend(f"{count} {encode_directions(d)}" for count, d in self.runs)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> Replay:
+        header_line, *lines = path.read_text().splitlines()
+        header = json.loads(header_line)
+        if header.get("version") != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {header.get('version')}")
+
+        map_file = Path(header["map"])
+        if not map_file.is_absolute():
+            map_file = PROJECT_DIR / map_file
+        replay = cls(map_file, header["seed"])
+        for line in lines:
+            if not line.strip():
+                continue
+            count, _, directions = line.partition(" ")
+            replay.runs.append((int(count), decode_directions(directions.strip())))
+        return replay
+
+
+def new_replay_path(map_file: Path) -> Path:
+    return REPLAYS_DIR / f"{map_file.stem}-{strftime('%Y%m%d-%H%M%S')}.replay"
+
+
+class ReplayInputManager(InputManager):
+    """Feeds recorded input back, one frame for each `poll`."""
+
+    def __init__(self, replay: Replay) -> None:
+        super().__init__()
+        self.replay = replay
+        self.rewind()
+
+    def rewind(self) -> None:
+        self.frames = self.replay.frames()
+        self.current: frozenset[Direction] = frozenset()
+        self.finished = False
+
+    def start(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+    def is_pressed(self, key_names: list[str]) -> bool:
+        return any(
+            key in self.keybindings[direction]
+            for direction in self.current
+            for key in key_names
+        )
+
+    def poll(self) -> set[Direction]:
+        current = next(self.frames, None)
+        if current is None:
+            self.finished = True
+            current = frozenset()
+        self.current = current
+        return set(current)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from time import strftime
+from uuid import uuid4
+
+from tofu_byte.config import user_dir
+from tofu_byte.objects.map import map_hash, map_key
+
+SCORES_DIR = user_dir / "scores"
+SCORES_VERSION = 2
+# Best runs kept in the index for every map
+TOP_SCORES = 10
+# See `map_hash`, older versions logged a CRC32
+MAP_HASH = re.compile("[0-9a-f]{40}")
+
+
+@dataclass(frozen=True)
+class Score:
+    id: str
+    # Version of the map the run was played on, see `map_hash`, empty when
+    # the map could not be read
+    map_hash: str
+    map: str
+    won: bool
+    points: int
+    max_points: int
+    time: float
+    date: str
+    replay: str | None = None
+
+    def rank(self) -> tuple[bool, int, float]:
+        # Won runs first, then more stars, then faster
+        return (not self.won, -self.points, self.time)
+
+
+def new_score(
+    map_file: Path,
+    won: bool,
+    points: int,
+    max_points: int,
+    time: float,
+    replay: Path | None = None,
+) -> Score:
+    # Map is hashed later, by the store in its own thread
+    return Score(
+        uuid4().hex,
+        "",
+        map_key(map_file),
+        won,
+        points,
+        max_points,
+        round(time, 3),
+        strftime("%Y-%m-%dT%H:%M:%S"),
+        None if replay is None else str(replay),
+    )
+
+
+class ScoreStore:
+    """Results of every run, in an append only log in `user_dir`.
+
+    The log has one JSON line per run. The index keeps the best runs of
+    every map and how much of the log it has seen. It is read on the first
+    query, only the part of the log after it is read again. A line cut by
+    a crash is skipped.
+
+    Everything runs in one thread of the store, in the order it was asked
+    for. `add` never waits, `top` waits for the writes before it and is
+    meant for worker threads.
+    """
+
+    def __init__(self, folder: Path = SCORES_DIR, keep: int = TOP_SCORES) -> None:
+        self.log_file = folder / "scores.log"
+        self.index_file = folder / "index.json"
+        self.keep = keep
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="scores")
+        self.loaded = False
+        # Map hash -> best runs, best first
+        self.best: dict[str, list[Score]] = {}
+        # Bytes of the log that are in `best`
+        self.log_size = 0
+
+    def add(self, score: Score, map_file: Path) -> Future[Score]:
+        return self.executor.submit(self._add, score, map_file)
+
+    def top(self, map_file: Path, count: int = TOP_SCORES) -> list[Score]:
+        return self.executor.submit(self._top, map_file, count).result()
+
+    def _add(self, score: Score, map_file: Path) -> Score:
+        try:
+            score = replace(score, map_hash=map_hash(map_file))
+        except OSError:
+            # Map is gone, the run is still logged but not indexed
+            pass
+        self._load()
+        line = (json.dumps(asdict(score)) + "\n").encode()
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_file, "ab") as f:
+                # A line cut by a crash is closed, so this one is read
+                if f.tell() and not self._ends_with_newline():
+                    f.write(b"\n")
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+        except OSError:
+            return score
+        if self.log_size == size - len(line):
+            self.log_size = size
+        self._merge(score)
+        self._save_index()
+        return score
+
+    def _top(self, map_file: Path, count: int) -> list[Score]:
+        self._load()
+        try:
+            key = map_hash(map_file)
+        except OSError:
+            return []
+        return self.best.get(key, [])[:count]
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.log_file, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _merge(self, score: Score) -> None:
+        # Runs without a sha1 map hash stay in the log only
+        if not MAP_HASH.fullmatch(score.map_hash):
+            return
+        scores = self.best.setdefault(score.map_hash, [])
+        # Runs already in the index are read again after a crash
+        if any(s.id == score.id for s in scores):
+            return
+        if len(scores) >= self.keep and score.rank() >= scores[-1].rank():
+            return
+        scores.append(score)
+        scores.sort(key=Score.rank)
+        del scores[self.keep :]
+
+    def _load(self) -> None:
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            data = json.loads(self.index_file.read_text())
+            if data.get("version") == SCORES_VERSION:
+                self.best = {
+                    key: [Score(**s) for s in scores]
+                    for key, scores in data["maps"].items()
+                }
+                self.log_size = data["log_size"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.best = {}
+            self.log_size = 0
+        if self._read_log():
+            self._save_index()
+
+    def _read_log(self) -> bool:
+        # Catches up with runs written after the index was saved
+        try:
+            with open(self.log_file, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() < self.log_size:
+                    # Log was replaced, the index is built again
+                    self.best = {}
+                    self.log_size = 0
+                f.seek(self.log_size)
+                tail = f.read()
+        except OSError:
+            return False
+        end = tail.rfind(b"\n") + 1
+        for line in tail[:end].splitlines():
+            try:
+                self._merge(Score(**json.loads(line)))
+            except (ValueError, TypeError):
+                continue
+        self.log_size += end
+        return end > 0
+
+    def _save_index(self) -> None:
+        data = {
+            "version": SCORES_VERSION,
+            "log_size": self.log_size,
+            "maps": {
+                key: [asdict(score) for score in scores]
+                for key, scores in self.best.items()
+            },
+        }
+        # Written next to the index and renamed, so it is never half saved
+        tmp = self.index_file.with_suffix(".json.tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.index_file)
+        except OSError:
+            pass
+
+
+SCORES = ScoreStore()
@@ -0,0 +1,275 @@
+"""Finds the shortest input that collects every star of a map and wins it.
+
+Breadth first search over frames of a `HeadlessScene`, so the player moves
+by the real states and collision rules. A search state is the player
+(position, state and what the state counts) and the collected stars, one
+bit per star. Of two states with the same player the one with fewer stars
+is dropped. Collected stars are taken out of the scene only while the
+player is next to them, further away they can not change a frame.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from textual.geometry import Offset
+
+from tofu_byte.game.events import EndBallCollected, HpChange
+from tofu_byte.game.headless import HeadlessScene
+from tofu_byte.game.models import ObjectModel
+from tofu_byte.game.replay import Replay
+from tofu_byte.objects.stars import EndBallLogic, StarLogic
+from tofu_byte.tools.tools import Direction, pressed
+
+# Pressed directions tried every frame, opposite directions are never
+# pressed together
+INPUTS: tuple[frozenset[Direction], ...] = (
+    pressed(),
+    pressed("l"),
+    pressed("r"),
+    pressed("u"),
+    pressed("d"),
+    pressed("l", "u"),
+    pressed("r", "u"),
+    pressed("l", "d"),
+    pressed("r", "d"),
+)
+MAX_STATES = 2_000_000
+
+# Position, state class and the attributes of the state
+PlayerKey = tuple[Offset, type, tuple[tuple[str, Any], ...]]
+# Pressed directions, next player id, stars touched and whether the EndBall was
+Transition = tuple[frozenset[Direction], int, int, bool]
+
+
+@dataclass
+class Solution:
+    map_file: Path
+    solved: bool
+    # Input of every frame, from the first frame of the map
+    inputs: list[frozenset[Direction]] = field(default_factory=list)
+    stars: list[Offset] = field(default_factory=list)
+    # Stars collected on some way through the map, not always on one
+    reachable_stars: list[Offset] = field(default_factory=list)
+    end_ball: bool = False
+    end_ball_reachable: bool = False
+    explored: int = 0
+    # False when the search stopped at `max_states`
+    complete: bool = True
+
+    def describe(self) -> str:
+        found = len(self.reachable_stars)
+        lines = [
+            f"{self.map_file.name}: "
+            + (f"solved in {len(self.inputs)} frames" if self.solved else "not solved")
+            + f", {self.explored} states"
+            + ("" if self.complete else " (search stopped)"),
+            f"stars reachable: {found}/{len(self.stars)}",
+        ]
+        missing = [star for star in self.stars if star not in self.reachable_stars]
+        if missing:
+            lines.append("unreachable: " + ", ".join(f"{p.x},{p.y}" for p in missing))
+        if self.end_ball:
+            lines.append(f"EndBall reachable: {self.end_ball_reachable}")
+        return "\n".join(lines)
+
+    def replay(self, seed: int = 0) -> Replay:
+        # Random effects do not change the run, any seed plays it the same
+        replay = Replay(self.map_file, seed)
+        for directions in self.inputs:
+            replay.record(set(directions))
+        return replay
+
+
+class Solver:
+    def __init__(self, game_file: Path) -> None:
+        self.game_file = game_file
+        self.scene = HeadlessScene(game_file)
+        # Headless scenes bake their grid while loading
+        occupancy = self.scene.occupancy
+        assert occupancy is not None
+        self.occupancy = occupancy
+        collectables = [
+            obj for obj in self.scene.colliders if isinstance(obj, StarLogic)
+        ]
+        self.end_balls = [obj for obj in collectables if isinstance(obj, EndBallLogic)]
+        self.stars: list[ObjectModel] = sorted(
+            (obj for obj in collectables if obj not in self.end_balls),
+            key=lambda obj: (obj.pos.y, obj.pos.x),
+        )
+        self.all_stars = (1 << len(self.stars)) - 1
+        # Stars the player can collide with from each position, the player
+        # moves at most one tile in every direction per frame
+        self.near: dict[Offset, int] = {}
+        for i, star in enumerate(self.stars):
+            for y in range(star.pos.y - 1, star.pos.y + star.m_size.height + 1):
+                for x in range(star.pos.x - 1, star.pos.x + star.m_size.width + 1):
+                    pos = Offset(x, y)
+                    self.near[pos] = self.near.get(pos, 0) | 1 << i
+        self.removed = 0
+        # Nothing below the lowest object can stop a fall
+        self.bottom = max(
+            (obj.pos.y + obj.m_size.height for obj in self.scene.colliders),
+            default=0,
+        )
+        # Players are numbered, nested keys are slow to hash over and over
+        self.players: list[PlayerKey] = []
+        self.player_ids: dict[PlayerKey, int] = {}
+        self.transitions: dict[tuple[int, int], list[Transition]] = {}
+
+    def player_key(self) -> PlayerKey:
+        state = self.scene.player.state
+        ignored = ("player",) if state.timed else ("player", "frame", "shown")
+        values = tuple(item for item in vars(state).items() if item[0] not in ignored)
+        return self.scene.player.position, type(state), values
+
+    def player_id(self) -> int:
+        key = self.player_key()
+        player_id = self.player_ids.get(key)
+        if player_id is None:
+            player_id = self.player_ids[key] = len(self.players)
+            self.players.append(key)
+        return player_id
+
+    def set_player(self, key: PlayerKey) -> None:
+        player = self.scene.player
+        player.position, state_type, values = key
+        player.state = player.get_state(state_type)
+        player.state.__dict__.update(values)
+
+    def remove_stars(self, mask: int) -> None:
+        # Collected stars still count as collisions, so they have to be gone
+        scene = self.scene
+        for i, star in enumerate(self.stars):
+            bit = 1 << i
+            if (mask ^ self.removed) & bit == 0:
+                continue
+            if mask & bit:
+                scene.colliders.remove(star)
+                scene.spatial_index.remove(star)
+                self.occupancy.remove(star)
+            else:
+                scene.colliders.add(star)
+                scene.spatial_index.add(star)
+                self.occupancy.add(star)
+        self.removed = mask
+
+    def step(
+        self, key: PlayerKey, removed: int, directions: frozenset[Direction]
+    ) -> Transition | None:
+        # None when the player dies or falls out of the map
+        self.set_player(key)
+        self.remove_stars(removed)
+        scene = self.scene
+        player = scene.player
+        # Same order as `HeadlessScene.tick`, objects have nothing to clear
+        player.update_clear_values()
+        player.handle_input(set(directions))
+        scene.check_collisions()
+        player.update_states()
+        player.state.get_frame()
+
+        stars = 0
+        won = False
+        if scene.messages:
+            died = any(isinstance(m, HpChange) for m in scene.messages)
+            won = any(isinstance(m, EndBallCollected) for m in scene.messages)
+            scene.messages.clear()
+            for i, star in enumerate(self.stars):
+                if star.should_remove:
+                    star.should_remove = False
+                    stars |= 1 << i
+            for end_ball in self.end_balls:
+                end_ball.should_remove = False
+            if died:
+                return None
+        if player.position.y > self.bottom:
+            return None
+        return directions, self.player_id(), stars, won
+
+    def successors(self, player_id: int, mask: int) -> list[Transition]:
+        # Worked out once for every player and collected stars next to it
+        key = self.players[player_id]
+        removed = mask & self.near.get(key[0], 0)
+        transitions = self.transitions.get((player_id, removed))
+        if transitions is None:
+            transitions = []
+            found: set[tuple[int, int, bool]] = set()
+            for directions in INPUTS:
+                transition = self.step(key, removed, directions)
+                if transition is None or transition[1:] in found:
+                    continue
+                found.add(transition[1:])
+                transitions.append(transition)
+            self.transitions[player_id, removed] = transitions
+        return transitions
+
+    def solve(self, max_states: int = MAX_STATES) -> Solution:
+        # A node is the player id above one bit per star
+        shift = len(self.stars)
+        start = self.player_id() << shift
+        parents: dict[int, tuple[int, frozenset[Direction]] | None] = {start: None}
+        seen: dict[int, list[int]] = {start >> shift: [0]}
+        queue = deque([start])
+        collected = 0
+        end_ball_reachable = False
+        # Without an EndBall the last star wins
+        needs_end_ball = bool(self.end_balls)
+        goal: int | None = None
+
+        while queue and goal is None and len(parents) <= max_states:
+            node = queue.popleft()
+            mask = node & self.all_stars
+            for directions, next_id, stars, won in self.successors(node >> shift, mask):
+                next_mask = mask | stars
+                next_node = next_id << shift | next_mask
+                collected |= next_mask
+                end_ball_reachable |= won
+                if next_mask == self.all_stars and (won or not needs_end_ball):
+                    parents[next_node] = (node, directions)
+                    goal = next_node
+                    break
+                if won:
+                    # The game is over before the other stars
+                    continue
+                if next_node in parents:
+                    # Checking the masks is slower
+                    continue
+                masks = seen.setdefault(next_id, [])
+                for m in masks:
+                    if m | next_mask == m:
+                        break
+                else:
+                    # Only masks no other one contains are kept
+                    masks[:] = [m for m in masks if m | next_mask != next_mask]
+                    masks.append(next_mask)
+                    parents[next_node] = (node, directions)
+                    queue.append(next_node)
+
+        inputs: list[frozenset[Direction]] = []
+        step = parents.get(goal) if goal is not None else None
+        while step is not None:
+            node, directions = step
+            inputs.append(directions)
+            step = parents[node]
+        inputs.reverse()
+        return Solution(
+            self.game_file,
+            goal is not None,
+            inputs,
+            stars=[star.pos for star in self.stars],
+            reachable_stars=[
+                star.pos for i, star in enumerate(self.stars) if collected >> i & 1
+            ],
+            end_ball=bool(self.end_balls),
+            end_ball_reachable=end_ball_reachable,
+            explored=len(parents),
+            complete=goal is not None or not queue,
+        )
+
+
+def solve(game_file: Path, max_states: int = MAX_STATES) -> Solution:
+    return Solver(game_file).solve(max_states)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from textual.geometry import Offset, Region
+
+if TYPE_CHECKING:
+    from tofu_byte.objects.base_object import ObjectLogic
+
+
+# Size (in tiles) of a single bucket of the grid
+CELL_SIZE = 4
+
+Cell = tuple[int, int]
+
+
+class SpatialIndex:
+    def __init__(self, cell_size: int = CELL_SIZE) -> None:
+        self.cell_size = cell_size
+        self.cells: defaultdict[Cell, set[ObjectLogic]] = defaultdict(set)
+        # Objects without bounds (e.g. KillingBondary) are candidates everywhere
+        self.unbounded: set[ObjectLogic] = set()
+        self.registered: dict[ObjectLogic, list[Cell]] = {}
+
+    def __len__(self) -> int:
+        return len(self.registered)
+
+    def __contains__(self, obj: object) -> bool:
+        return obj in self.registered
+
+    def _cells_of(self, region: Region) -> list[Cell]:
+        if region.width <= 0 or region.height <= 0:
+            return []
+        cs = self.cell_size
+        x0, y0 = region.x // cs, region.y // cs
+        x1, y1 = (region.right - 1) // cs, (region.bottom - 1) // cs
+        return [(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+    def add(self, obj: ObjectLogic) -> None:
+        if obj in self.registered:
+            self.remove(obj)
+
+        region = obj.collision_region()
+        if region is None:
+            self.unbounded.add(obj)
+            self.registered[obj] = []
+            return
+
+        cells = self._cells_of(region)
+        for cell in cells:
+            self.cells[cell].add(obj)
+        self.registered[obj] = cells
+
+    def remove(self, obj: ObjectLogic) -> None:
+        cells = self.registered.pop(obj, None)
+        if cells is None:
+            return
+        self.unbounded.discard(obj)
+        for cell in cells:
+            bucket = self.cells[cell]
+            bucket.discard(obj)
+            if not bucket:
+                del self.cells[cell]
+
+    def update(self, obj: ObjectLogic) -> None:
+        if obj in self.registered:
+            self.add(obj)
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.unbounded.clear()
+        self.registered.clear()
+
+    def query(self, pos: Offset) -> list[ObjectLogic]:
+        cs = self.cell_size
+        bucket = self.cells.get((pos.x // cs, pos.y // cs))
+        if not bucket:
+            return list(self.unbounded)
+        if not self.unbounded:
+            return list(bucket)
+        return [*bucket, *self.unbounded]
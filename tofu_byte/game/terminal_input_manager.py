@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from time import monotonic
+
+from .input_manager import DIRECTION_BITS, InputManager
+
+# Directions on the same axis, pressing one releases the other
+OPPOSITE_BITS = {
+    DIRECTION_BITS["l"]: DIRECTION_BITS["r"],
+    DIRECTION_BITS["r"]: DIRECTION_BITS["l"],
+    DIRECTION_BITS["u"]: DIRECTION_BITS["d"],
+    DIRECTION_BITS["d"]: DIRECTION_BITS["u"],
+}
+
+
+class TerminalInputManager(InputManager):
+    """Builds held keys from the key events of the terminal.
+
+    Terminals only send presses, a held key is sent again by auto-repeat.
+    A key counts as held until `first_hold` seconds after the first press,
+    which covers the delay before auto-repeat starts, and `repeat_hold`
+    seconds after every repeat.
+    """
+
+    first_hold: float = 0.5
+    repeat_hold: float = 0.1
+
+    def __init__(self, clock: Callable[[], float] = monotonic) -> None:
+        super().__init__()
+        self.clock = clock
+        # Key name -> time until it counts as held
+        self.held: dict[str, float] = {}
+        self.running = False
+
+    def start(self) -> None:
+        self.running = True
+
+    def stop(self) -> None:
+        self.running = False
+        self.held.clear()
+
+    def feed_key(self, key: str) -> bool:
+        # Returns True if the key is one of the movement keys
+        mask = self.key_masks.get(key)
+        if mask is None or not self.running:
+            return False
+        now = self.clock()
+        repeat = key in self.held and self.held[key] >= now
+        self.held[key] = now + (self.repeat_hold if repeat else self.first_hold)
+        opposite = OPPOSITE_BITS.get(mask, 0)
+        for other in list(self.held):
+            if self.key_masks[other] & opposite:
+                del self.held[other]
+        return True
+
+    def is_pressed(self, key_names: list[str]) -> bool:
+        now = self.clock()
+        return any(self.held.get(key, 0) >= now for key in key_names)
+
+    def snapshot(self) -> int:
+        now = self.clock()
+        mask = 0
+        for key, until in list(self.held.items()):
+            if until < now:
+                del self.held[key]
+            else:
+                mask |= self.key_masks[key]
+        return mask
@@ -1,15 +1,23 @@
 from __future__ import annotations
 from typing import Set, List, Optional
-import threading
 from pynput import keyboard
 from pynput.keyboard import Key, KeyCode
 from .input_manager import InputManager
 
 
 class UnixInputManager(InputManager):
+    """Reads the keyboard with pynput, from the listener thread.
+
+    Only the listener thread changes `keys_pressed`, it publishes the
+    directions as a new `mask` int, so the game reads it without a lock.
+    """
+
+    global_hook: bool = True
+
     def __init__(self) -> None:
+        super().__init__()
         self.keys_pressed: Set[str] = set()
-        self.lock: threading.Lock = threading.Lock()
+        self.mask = 0
         self.listener: Optional[keyboard.Listener] = None
 
     def start(self) -> None:
@@ -34,18 +42,26 @@ class UnixInputManager(InputManager):
             return key.name
         return None
 
+    def _publish(self) -> None:
+        mask = 0
+        for key in self.keys_pressed:
+            mask |= self.key_masks.get(key, 0)
+        self.mask = mask
+
     def _on_press(self, key: Key | KeyCode | None) -> None:
         key_str = self._get_key_str(key)
-        if key_str is not None:
-            with self.lock:
-                self.keys_pressed.add(key_str)
+        if key_str is not None and key_str not in self.keys_pressed:
+            self.keys_pressed.add(key_str)
+            self._publish()
 
     def _on_release(self, key: Key | KeyCode | None) -> None:
         key_str = self._get_key_str(key)
-        if key_str is not None:
-            with self.lock:
-                self.keys_pressed.discard(key_str)
+        if key_str is not None and key_str in self.keys_pressed:
+            self.keys_pressed.discard(key_str)
+            self._publish()
 
     def is_pressed(self, key_names: List[str]) -> bool:
-        with self.lock:
-            return any(k in self.keys_pressed for k in key_names)
+        return any(k in self.keys_pressed for k in key_names)
+
+    def snapshot(self) -> int:
+        return self.mask
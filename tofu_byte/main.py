@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Callable
+
 from textual.app import App
 from textual.binding import Binding
+from textual.screen import Screen
 from tofu_byte.config import get_setting, set_setting
-from tofu_byte.screens.menu.about import About
-from tofu_byte.screens.menu.map_loader import MapEditor, MapLoader
-from tofu_byte.screens.menu.menu import Menu
-
-from tofu_byte.screens.menu.pause import PauseMenu
-from tofu_byte.screens.menu.troubleshooting import Troubleshooting
 from tofu_byte.themes import TOFU_BUILTIN_THEMES
 
+if TYPE_CHECKING:
+    from tofu_byte.game.replay import Replay
+
+
+def lazy_screen(module: str, name: str) -> Callable[[], Screen[Any]]:
+    # Module of the screen is imported when it is pushed the first time
+    def create() -> Screen[Any]:
+        return getattr(import_module(module), name)()
+
+    return create
+
 
 class GameMenu(App[None]):
     CSS_PATH = [
@@ -26,18 +35,22 @@ class GameMenu(App[None]):
         Binding("]", "next_theme", "Next theme"),
     ]
     SCREENS = {
-        "menu": Menu,
-        "map_loader": MapLoader,
-        "map_editor": MapEditor,
-        "pause_menu": PauseMenu,
-        "troubleshooting": Troubleshooting,
-        "about": About,
+        "menu": lazy_screen("tofu_byte.screens.menu.menu", "Menu"),
+        "map_loader": lazy_screen("tofu_byte.screens.menu.map_loader", "MapLoader"),
+        "map_editor": lazy_screen("tofu_byte.screens.menu.map_loader", "MapEditor"),
+        "pause_menu": lazy_screen("tofu_byte.screens.menu.pause", "PauseMenu"),
+        "troubleshooting": lazy_screen(
+            "tofu_byte.screens.menu.troubleshooting", "Troubleshooting"
+        ),
+        "about": lazy_screen("tofu_byte.screens.menu.about", "About"),
     }
 
     def __init__(
         self,
+        replay: Replay | None = None,
     ):
         super().__init__()
+        self.replay = replay
         for name, theme in TOFU_BUILTIN_THEMES.items():
             self.register_theme(theme)
         self.theme_names = [name for name, _ in TOFU_BUILTIN_THEMES.items()]
@@ -46,6 +59,12 @@ class GameMenu(App[None]):
 
     def on_mount(self):
         self.push_screen("menu")
+        if self.replay is not None:
+            from tofu_byte.screens.game_display import GameScreenContainer
+            from tofu_byte.screens.menu.map_loader import MapChain
+
+            map_chain = MapChain(0, [self.replay.map_file])
+            self.push_screen(GameScreenContainer(map_chain, replay=self.replay))
 
     def action_next_theme(self) -> None:
         themes = self.theme_names
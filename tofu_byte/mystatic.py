@@ -1,13 +1,20 @@
 import math
 from time import monotonic
-from typing import Any
-from textual.color import Color
+from typing import TYPE_CHECKING, Any
 from textual.containers import Container, Horizontal
+from textual.geometry import Region
+from textual.message import Message
 from textual.reactive import reactive
+from textual.widget import Widget
 from textual.widgets import Static, Digits
+from rich.style import Style
 from rich.text import Text
 
 from tofu_byte.screens.const import YOU_LOOSE, YOU_WON
+from tofu_byte.themes import Palette, palette_for
+
+if TYPE_CHECKING:
+    from tofu_byte.objects.base_object import MouseState
 
 
 def minmax(value: int, min_v: int = 0, max_v: int = 255):
@@ -16,6 +23,8 @@ def minmax(value: int, min_v: int = 0, max_v: int = 255):
 
 class MyText(Text):
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, MyText):
             return NotImplemented
         return (
@@ -99,13 +108,8 @@ class ThemeScreenTitle(ScreenTitle):
         )
         self.watch(self.app, "theme", self.on_theme_change, init=False)
 
-    def _from_values(self, theme: str) -> str:
-        return (
-            self.app.available_themes[theme].to_color_system().generate()["secondary"]
-        )
-
-    def _to_values(self, theme: str) -> str:
-        return self.app.available_themes[theme].to_color_system().generate()["accent"]
+    from_variable = "secondary"
+    to_variable = "accent"
 
     def on_theme_change(self, new_theme: str) -> None:
         self.start_values, self.modify_values = self._start_values(new_theme)
@@ -113,8 +117,9 @@ class ThemeScreenTitle(ScreenTitle):
     def _start_values(
         self, theme: str
     ) -> tuple[tuple[int, int, int], tuple[int, int, int]]:
-        prim = Color.parse(self._from_values(theme)).rgb
-        sec = Color.parse(self._to_values(theme)).rgb
+        palette = palette_for(self.app.available_themes[theme])
+        prim = palette.color(self.from_variable).rgb
+        sec = palette.color(self.to_variable).rgb
         avg: list[int] = []
         change: list[int] = []
         for a, b in zip(prim, sec):
@@ -124,47 +129,70 @@ class ThemeScreenTitle(ScreenTitle):
 
 
 class YouWonScreenTitle(ThemeScreenTitle):
+    from_variable = "success-darken-1"
+    to_variable = "success-lighten-1"
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(YOU_WON, *args, **kwargs)
 
-    def _from_values(self, theme: str) -> str:
-        return (
-            self.app.available_themes[theme]
-            .to_color_system()
-            .generate()["success-darken-1"]
-        )
-
-    def _to_values(self, theme: str) -> str:
-        return (
-            self.app.available_themes[theme]
-            .to_color_system()
-            .generate()["success-lighten-1"]
-        )
-
 
 class YouLoseScreenTitle(ThemeScreenTitle):
+    from_variable = "error-darken-1"
+    to_variable = "error-lighten-1"
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(YOU_LOOSE, *args, **kwargs)
 
-    def _from_values(self, theme: str) -> str:
-        return (
-            self.app.available_themes[theme]
-            .to_color_system()
-            .generate()["error-darken-1"]
-        )
 
-    def _to_values(self, theme: str) -> str:
-        return (
-            self.app.available_themes[theme]
-            .to_color_system()
-            .generate()["error-lighten-1"]
-        )
+class PrimaryScreenTitle(ThemeScreenTitle): ...
 
 
-class PrimaryScreenTitle(ThemeScreenTitle): ...
+class GameObjectStatic(Static):
+    # Set when CanvasDisplay paints the object, so it is never mounted
+    canvas: Widget | None = None
+    # Set when the object has to be repainted, cleared by `Display.present`
+    dirty: bool = True
+    # Lower ranks are drawn below others of the same layer number
+    layer_rank: int = 0
+    curr_frame: Text
+    # Editable drawables track the mouse, also when a canvas paints them
+    mouse_state: "MouseState"
+    # Theme variables of the text and background, see `set_palette`
+    theme_colors: tuple[str, str] = ("panel", "panel")
+    palette: Palette | None = None
+    palette_style: Style = Style()
 
+    def on_mount(self) -> None:
+        # Displays push the palette to their drawables, others follow the theme
+        if self.palette is None:
+            self.set_palette(palette_for(self.app.current_theme))
+            self.watch(self.app, "theme", self.on_theme_change, init=False)
 
-class GameObjectStatic(Static): ...
+    def on_theme_change(self, new_theme: str) -> None:
+        self.set_palette(palette_for(self.app.available_themes[new_theme]))
+
+    def set_palette(self, palette: Palette) -> None:
+        self.palette = palette
+        self.palette_style = palette.style(*self.theme_colors)
+        self.mark_dirty()
+
+    def post_message(self, message: Message) -> bool:
+        # Not running when painted by a canvas, the canvas passes them on
+        if self.canvas is not None:
+            return self.canvas.post_message(message)
+        return super().post_message(message)
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+
+    def canvas_region(self) -> Region:
+        return Region(self.offset.x, self.offset.y, 1, 1)
+
+    def show_frame(self, frame: Text) -> None:
+        self.curr_frame = frame
+        self.dirty = True
+        if self.canvas is None:
+            self.update(frame)
 
 
 class MapName(GameObjectStatic):
@@ -6,9 +6,10 @@ from typing import TYPE_CHECKING, Any, Callable, Concatenate, ParamSpec, TypeVar
 from textual.app import ComposeResult, RenderResult
 from textual.containers import Horizontal
 from textual.events import MouseMove
-from textual.geometry import Size, Offset
+from textual.geometry import Region, Size, Offset
 from textual.reactive import reactive
 from rich.style import Style
+from textual.message import Message
 from textual.widgets import Button, Input, Static
 from textual import events
 
@@ -70,17 +71,74 @@ def _editable(
     return wrapper
 
 
-class BaseObject(GameObjectStatic):
-    type_name = "Undefined"
-    m_size = reactive(Size(0, 0), recompose=True)
+class ObjectLogic:
+    """Game rules of an object, shared by widgets and headless models."""
+
     blocks = True
     triggers = False
+    min_size: Size = Size(1, 1)
+    max_size: Size = Size(-1, -1)
+    pos: Offset
+    m_size: Size
+    should_remove: bool
+    last_collision_event: CollisionEvent | None
+    post_message: Callable[[Message], bool]
+
+    def occupies_tile(self, pos: Offset) -> bool:
+        return (
+            self.pos.x <= pos.x < self.pos.x + self.m_size.width
+            and self.pos.y <= pos.y < self.pos.y + self.m_size.height
+        )
+
+    def occupies_dead_zone(self, pos: Offset) -> bool:
+        return False
+
+    def collision_region(self) -> Region | None:
+        # Bounds of every tile `occupies_tile` can return True for,
+        # None if the object can collide anywhere
+        return Region(self.pos.x, self.pos.y, self.m_size.width, self.m_size.height)
+
+    def blocks_movement(self, event: CollisionEvent) -> bool:
+        return bool(self.blocks)
+
+    def on_collision(self, event: CollisionEvent) -> None:
+        self.last_collision_event = event
+
+    def update_clear_values(self):
+        self.last_collision_event = None
+
+    def validate_m_size_width(self, new_width: int) -> int:
+        if self.min_size.width != -1:
+            new_width = max(new_width, self.min_size.width)
+        if self.max_size.width != -1:
+            new_width = min(new_width, self.max_size.width)
+        return new_width
+
+    def validate_m_size_height(self, new_height: int) -> int:
+        if self.min_size.height != -1:
+            new_height = max(new_height, self.min_size.height)
+
+        if self.max_size.height != -1:
+            new_height = min(new_height, self.max_size.height)
+        return new_height
+
+    def validate_m_size(self, new_size: Size):
+        return Size(
+            self.validate_m_size_width(new_size.width),
+            self.validate_m_size_height(new_size.height),
+        )
+
+
+class BaseObject(ObjectLogic, GameObjectStatic):
+    type_name = "Undefined"
+    m_size = reactive(Size(0, 0), recompose=True)
     editable = reactive(False)
     layer_number = reactive(2)
     icon = ["🬰", "🬴", "🬸", "▆", "▗", "▖", "▛", "▜", "▟", "◢", "◣", "▐", "▌", "▬", "■"]
     resizeble: bool = True
-    min_size: Size = Size(1, 1)
-    max_size: Size = Size(-1, -1)
+    # Frame changes on its own, see `advance_animation`
+    animated: bool = False
+    theme_colors: tuple[str, str] = ("surface-darken-3", "surface")
 
     def __init__(
         self,
@@ -111,8 +169,9 @@ class BaseObject(GameObjectStatic):
         return ""
 
     def set_layer_number(self):
-        self.styles.layer = f"a{self.layer_number}{self.type_name}{id(self)}"
-        self.post_message(LayerNumberChange())
+        self.styles.layer = f"a{self.layer_number}{self.type_name}"
+        self.mark_dirty()
+        self.post_message(LayerNumberChange(self))
 
     def watch_layer_number(self):
         self.set_layer_number()
@@ -120,37 +179,43 @@ class BaseObject(GameObjectStatic):
     def watch_m_size(self, new_size: Size):
         self.styles.width = new_size.width
         self.styles.height = new_size.height
+        self.mark_dirty()
 
     def focused_editable(self, is_focused_editable: bool):
         self._focused_editable = is_focused_editable
+        self.mark_dirty()
         if is_focused_editable:
             self.add_class("focused_editable")
         else:
             self.remove_class("focused_editable")
 
-    def occupies_tile(self, pos: Offset) -> bool:
-        return (
-            self.pos.x <= pos.x < self.pos.x + self.m_size.width
-            and self.pos.y <= pos.y < self.pos.y + self.m_size.height
-        )
-
-    def blocks_movement(self, event: CollisionEvent) -> bool:
-        return bool(self.blocks)
-
     def on_collision(self, event: CollisionEvent) -> None:
-        self.last_collision_event = event
+        super().on_collision(event)
+        if DEBUG["contact_dir"]:
+            self.mark_dirty()
 
     def update_clear_values(self):
+        if self.last_collision_event and DEBUG["contact_dir"]:
+            self.mark_dirty()
+        super().update_clear_values()
+
+    def advance_animation(self) -> None:
+        # Called every frame for `animated` objects, has to mark the object
+        # dirty when its frame changes
+        ...
+
+    def snapshot(self) -> Any:
+        # State that changes while playing, see `Scene.take_snapshot`
+        return None
+
+    def restore(self, state: Any) -> None:
+        self.should_remove = False
         self.last_collision_event = None
 
     def reload(self):
-        if self.last_collision_event:
-            ...
-
         new_frame = self.render()
         if new_frame != self.curr_frame:
-            self.curr_frame = new_frame
-            self.update(new_frame)
+            self.show_frame(new_frame)
 
     # def my_update(self, content):
     #     self.__content = content
@@ -171,10 +236,8 @@ class BaseObject(GameObjectStatic):
                 return Style(color=color)
         return None
 
-    def default_colors(self) -> tuple[str, str]:
-        background = self.app.theme_variables["surface"]
-        color = self.app.theme_variables["surface-darken-3"]
-        return background, color
+    def canvas_region(self) -> Region:
+        return Region(self.pos.x, self.pos.y, self.m_size.width, self.m_size.height)
 
     # ========================
 
@@ -214,6 +277,7 @@ class BaseObject(GameObjectStatic):
     def move(self, delta: Offset):
         self.pos = self.pos + delta
         self.styles.offset = Offset(self.pos.x, self.pos.y)
+        self.mark_dirty()
         self.mouse_state = MouseState.MOUSE_DRAGGING
 
     def resize(self, delta: Offset, send_event: bool = True):
@@ -230,27 +294,6 @@ class BaseObject(GameObjectStatic):
     async def on_mouse_move(self, event: MouseMove):
         pass
 
-    def validate_m_size_width(self, new_width: int) -> int:
-        if self.min_size.width != -1:
-            new_width = max(new_width, self.min_size.width)
-        if self.max_size.width != -1:
-            new_width = min(new_width, self.max_size.width)
-        return new_width
-
-    def validate_m_size_height(self, new_height: int) -> int:
-        if self.min_size.height != -1:
-            new_height = max(new_height, self.min_size.height)
-
-        if self.max_size.height != -1:
-            new_height = min(new_height, self.max_size.height)
-        return new_height
-
-    def validate_m_size(self, new_size: Size):
-        return Size(
-            self.validate_m_size_width(new_size.width),
-            self.validate_m_size_height(new_size.height),
-        )
-
     def edit_compose(self) -> ComposeResult:
         delete_button = Button("Delete Object", id="delete_object", variant="error")
         copy_button = Button("Copy Object", id="copy_object", variant="warning")
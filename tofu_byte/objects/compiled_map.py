@@ -0,0 +1,205 @@
+"""Binary copy of a JSON map, loaded without parsing JSON.
+
+The compiled file lives next to the JSON one, with `.tmap` suffix. Layout,
+little endian: header, summary, author string ids, object table and string
+table. Types, texts and metadata are stored once in the string table.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import zlib
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"TMAP"
+FORMAT_VERSION = 1
+COMPILED_SUFFIX = ".tmap"
+
+# magic, version, size, mtime_ns and crc32 of the JSON source
+HEADER = struct.Struct("<4sHxxQqI")
+# hp, points, winning_ball, objects, strings, name, game_version, authors
+SUMMARY = struct.Struct("<iIBxxxIIiiI")
+STRING_ID = struct.Struct("<i")
+# type, flags, x, y, width, height, layer_number, text_value
+OBJECT = struct.Struct("<iBxhhHHhi")
+LENGTH = struct.Struct("<I")
+
+HAS_SIZE = 1
+HAS_TEXT = 2
+NO_STRING = -1
+
+
+def compiled_path(file: Path) -> Path:
+    return file.with_suffix(COMPILED_SUFFIX)
+
+
+def summarize_objects(objects: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "points": sum(obj["type"] == "Star" for obj in objects),
+        "winning_ball": any(obj["type"] == "EndBall" for obj in objects),
+    }
+
+
+def _pair(values: list[int]) -> tuple[int, int]:
+    # Missing values are zero, like for `Offset(*pos)` and `Size(*size)`
+    x, y = [*values, 0, 0][:2]
+    return x, y
+
+
+class _Strings:
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+
+    def add(self, value: str | None) -> int:
+        if value is None:
+            return NO_STRING
+        return self.ids.setdefault(value, len(self.ids))
+
+    def pack(self) -> bytes:
+        parts: list[bytes] = []
+        for value in self.ids:
+            data = value.encode()
+            parts.append(LENGTH.pack(len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+
+def compile_map(map_config: dict[str, Any], source: bytes, mtime_ns: int) -> bytes:
+    strings = _Strings()
+    objects: list[bytes] = []
+    for obj in map_config["objects"]:
+        flags = 0
+        width = height = 0
+        if "size" in obj:
+            flags |= HAS_SIZE
+            width, height = _pair(obj["size"])
+        text = obj.get("text_value")
+        if text is not None:
+            flags |= HAS_TEXT
+        objects.append(
+            OBJECT.pack(
+                strings.add(obj["type"]),
+                flags,
+                *_pair(obj["pos"]),
+                width,
+                height,
+                obj.get("layer_number", 1),
+                strings.add(text),
+            )
+        )
+
+    summary = summarize_objects(map_config["objects"])
+    authors = [strings.add(author) for author in map_config.get("authors", [])]
+    name = strings.add(map_config.get("name"))
+    game_version = strings.add(map_config.get("game_version"))
+    return b"".join(
+        [
+            HEADER.pack(
+                MAGIC, FORMAT_VERSION, len(source), mtime_ns, zlib.crc32(source)
+            ),
+            SUMMARY.pack(
+                map_config["hp"],
+                summary["points"],
+                summary["winning_ball"],
+                len(objects),
+                len(strings.ids),
+                name,
+                game_version,
+                len(authors),
+            ),
+            *(STRING_ID.pack(author) for author in authors),
+            *objects,
+            strings.pack(),
+        ]
+    )
+
+
+def write_compiled_map(file: Path) -> Path:
+    source = file.read_bytes()
+    data = compile_map(json.loads(source), source, file.stat().st_mtime_ns)
+    target = compiled_path(file)
+    target.write_bytes(data)
+    return target
+
+
+def _source_matches(file: Path, size: int, mtime_ns: int, crc: int) -> bool:
+    try:
+        stat = file.stat()
+    except FileNotFoundError:
+        # Only the compiled map is shipped
+        return True
+    if stat.st_size != size:
+        return False
+    if stat.st_mtime_ns == mtime_ns:
+        return True
+    # Copied or installed maps get new times, the content decides
+    return zlib.crc32(file.read_bytes()) == crc
+
+
+def _decode(buffer: mmap.mmap | bytes, file: Path) -> dict[str, Any] | None:
+    magic, version, size, mtime_ns, crc = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    if not _source_matches(file, size, mtime_ns, crc):
+        return None
+
+    offset = HEADER.size
+    hp, points, winning_ball, n_objects, n_strings, name, version_id, n_authors = (
+        SUMMARY.unpack_from(buffer, offset)
+    )
+    offset += SUMMARY.size
+    author_ids = [
+        STRING_ID.unpack_from(buffer, offset + i * STRING_ID.size)[0]
+        for i in range(n_authors)
+    ]
+    offset += n_authors * STRING_ID.size
+    objects_end = offset + n_objects * OBJECT.size
+    rows = list(OBJECT.iter_unpack(buffer[offset:objects_end]))
+
+    strings: list[str] = []
+    offset = objects_end
+    for _ in range(n_strings):
+        (length,) = LENGTH.unpack_from(buffer, offset)
+        offset += LENGTH.size
+        strings.append(bytes(buffer[offset : offset + length]).decode())
+        offset += length
+
+    objects: list[dict[str, Any]] = []
+    for type_id, flags, x, y, width, height, layer_number, text_id in rows:
+        obj: dict[str, Any] = {
+            "type": strings[type_id],
+            "pos": [x, y],
+            "layer_number": layer_number,
+        }
+        if flags & HAS_SIZE:
+            obj["size"] = [width, height]
+        if flags & HAS_TEXT:
+            obj["text_value"] = strings[text_id]
+        objects.append(obj)
+
+    map_config: dict[str, Any] = {
+        "objects": objects,
+        "hp": hp,
+        "authors": [strings[i] for i in author_ids],
+        "summary": {"points": points, "winning_ball": bool(winning_ball)},
+    }
+    if name != NO_STRING:
+        map_config["name"] = strings[name]
+    if version_id != NO_STRING:
+        map_config["game_version"] = strings[version_id]
+    return map_config
+
+
+def read_compiled_map(file: Path) -> dict[str, Any] | None:
+    # Same dict as the JSON map gives, None when there is no valid compiled map
+    path = compiled_path(file)
+    try:
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as buffer:
+            return _decode(buffer, file)
+    except (OSError, ValueError, struct.error, IndexError, UnicodeDecodeError):
+        return None
@@ -1,9 +1,23 @@
-from dataclasses import dataclass
-from random import randint
+from dataclasses import dataclass, field
+from functools import cache
+from random import Random
 from typing import List, Union
 
+from rich.style import Style
 from textual.geometry import Offset
 
+from tofu_byte.mystatic import MyText
+from tofu_byte.tools.rng import run_random
+
+
+@cache
+def styled_frames(
+    animation: tuple[str, ...], style: Style | None = None
+) -> tuple[MyText, ...]:
+    # Shared between all objects, so equal frames are also the same object.
+    # Styles come from the theme, a new theme builds a new table
+    return tuple(MyText(frame, style=style or "") for frame in animation)
+
 
 @dataclass
 class Faze:
@@ -12,22 +26,37 @@ class Faze:
     animation: List[str]
     direction: Offset = Offset(0, 0)
     next_faze: Union["Faze", None] = None
+    # Index into `animation` for every value of `frame`
+    indices: tuple[int, ...] = field(init=False, repr=False)
+    index: int = field(init=False, default=0)
 
-    def get_frame(self):
+    def __post_init__(self) -> None:
+        step = self.max_frame // len(self.animation) + 1
+        self.indices = tuple(f // step for f in range(self.max_frame + 1))
+
+    def get_index(self) -> int:
         if self.frame is None:
-            return self.animation[0]
+            self.index = 0
+            return 0
 
         self.frame += 1
         if self.frame > self.max_frame:
             self.frame = 0
 
-        frame = self.frame // (self.max_frame // len(self.animation) + 1)
-        return self.animation[frame]
+        self.index = self.indices[self.frame]
+        return self.index
+
+    def get_frame(self):
+        return self.animation[self.get_index()]
 
-    def get_random_frame(self):
+    def get_random_index(self, rng: Random = run_random) -> int:
         if self.frame is None:
-            return self.animation[0]
+            self.index = 0
+            return 0
+
+        self.frame = rng.randint(0, self.max_frame)
+        self.index = self.indices[self.frame]
+        return self.index
 
-        self.frame = randint(0, self.max_frame)
-        frame = self.frame // (self.max_frame // len(self.animation) + 1)
-        return self.animation[frame]
+    def get_random_frame(self, rng: Random = run_random):
+        return self.animation[self.get_random_index(rng)]
@@ -7,7 +7,7 @@ from textual.widgets import Input
 
 from tofu_byte.type_register import register
 from tofu_byte.mystatic import MyText
-from .base_object import BaseObject, LabeledInput
+from .base_object import BaseObject, LabeledInput, ObjectLogic
 from typing import Any
 
 
@@ -20,12 +20,16 @@ class TextObjectParameters:
     text_value: str
 
 
-@register
-class FloatingText(BaseObject):
-    type_name = "Text"
+class TextLogic(ObjectLogic):
     blocks: bool = False
     triggers: bool = False
+
+
+@register
+class FloatingText(TextLogic, BaseObject):
+    type_name = "Text"
     resizeble: bool = True
+    theme_colors: tuple[str, str] = ("text-accent", "background")
 
     def __init__(
         self,
@@ -39,11 +43,6 @@ class FloatingText(BaseObject):
         self.text_value = text_value
         self.update(self.render())
 
-    def default_colors(self) -> tuple[str, str]:
-        color = self.app.theme_variables["success"]
-        background = self.app.theme_variables["background"]
-        return color, background
-
     def render(self) -> RenderResult:
         style = self.set_colors()
         return MyText(self.text_value, style=style)
@@ -4,15 +4,19 @@ from textual.geometry import Offset, Size
 
 from tofu_byte.type_register import register
 from tofu_byte.mystatic import MyText
-from .base_object import BaseObject
+from .base_object import BaseObject, ObjectLogic
 
 
-@register
-class Floor(BaseObject):
-    type_name = "Floor"
+class FloorLogic(ObjectLogic):
     blocks = True
     triggers = True
+
+
+@register
+class Floor(FloorLogic, BaseObject):
+    type_name = "Floor"
     icon = ["🬰", "🬴", "🬸", "🬕", "🬲", " ", "🬨", "🬷", "▌", "▐", "🬂", "🬭", "█"]
+    theme_colors: tuple[str, str] = ("secondary", "panel")
 
     def __init__(
         self,
@@ -23,11 +27,6 @@ class Floor(BaseObject):
     ) -> None:
         super().__init__(pos, size, *args, **kwargs)
 
-    def default_colors(self) -> tuple[str, str]:
-        background = self.app.theme_variables["surface"]
-        color = self.app.theme_variables["surface-darken-3"]
-        return background, color
-
     def render(self) -> RenderResult:
         style = self.set_colors()
         text = MyText(no_wrap=False, end="", style=style)
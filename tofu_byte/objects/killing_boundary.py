@@ -1,17 +1,29 @@
 from __future__ import annotations
 
 from typing import Any
-from textual.geometry import Offset, Size
+from textual.geometry import Offset, Region, Size
 
-from tofu_byte.objects.base_object import BaseObject
+from tofu_byte.objects.base_object import BaseObject, ObjectLogic
 from tofu_byte.player.collision import CollisionEvent
 from tofu_byte.type_register import register
 
 
+class KillingBondaryLogic(ObjectLogic):
+    triggers = True
+
+    def occupies_tile(self, pos: Offset) -> bool:
+        return not super().occupies_tile(pos)
+
+    def collision_region(self) -> Region | None:
+        return None
+
+    def on_collision(self, event: CollisionEvent) -> None:
+        event.player.damage()
+
+
 @register
-class KillingBondary(BaseObject):
+class KillingBondary(KillingBondaryLogic, BaseObject):
     type_name = "KillingBondary"
-    triggers = True
 
     def __init__(
         self,
@@ -22,14 +34,9 @@ class KillingBondary(BaseObject):
     ) -> None:
         super().__init__(pos, size, layer_number=0, *args, **kwargs)
 
-    def occupies_tile(self, pos: Offset) -> bool:
-        return not super().occupies_tile(pos)
-
-    def on_collision(self, event: CollisionEvent) -> None:
-        event.player.damage()
-
     def watch_editable(self, new_value: bool):
         if new_value:
             self.display = True
         else:
             self.display = False
+        self.mark_dirty()
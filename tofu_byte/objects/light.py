@@ -1,23 +1,43 @@
+from functools import cache
 from typing import Any
 from rich.style import Style
 from rich.text import Text
 from textual.app import RenderResult
 from textual.geometry import Offset, Size
 
+from tofu_byte.mystatic import MyText
 from tofu_byte.objects.faze import Faze
+from tofu_byte.themes import Palette
 from tofu_byte.type_register import register
-from .base_object import BaseObject
-from random import randint
+from .base_object import BaseObject, ObjectLogic
+from tofu_byte.tools.rng import object_random
 
 light_faze = Faze(0, 8, ["🬷", "🬳", "🬯", "🬶", "🬲", "🬮", "▟"])
 
 
-@register
-class Light(BaseObject):
-    type_name = "Light"
+@cache
+def light_frames(flame_style: Style, lamp_style: Style) -> tuple[Text, ...]:
+    frames: list[Text] = []
+    for flame in light_faze.animation:
+        text = MyText()
+        text.append(flame, style=flame_style)
+        text.append("🬗", style=lamp_style)
+        frames.append(text)
+    return tuple(frames)
+
+
+class LightLogic(ObjectLogic):
     blocks: bool = False
     triggers: bool = False
+
+
+@register
+class Light(LightLogic, BaseObject):
+    type_name = "Light"
     resizeble: bool = False
+    animated: bool = True
+    theme_colors: tuple[str, str] = ("panel", "background")
+    frames: tuple[Text, ...] = ()
 
     def __init__(
         self,
@@ -29,31 +49,38 @@ class Light(BaseObject):
         **kwargs: Any,
     ) -> None:
         super().__init__(pos, size, *args, **kwargs)
+        self.rng = object_random()
         self.animation = light_faze
-        self.animation.frame = randint(0, self.animation.max_frame)
+        self.animation.frame = self.rng.randint(0, self.animation.max_frame)
+        self.index = self.animation.get_random_index(self.rng)
 
-    def default_colors(self) -> tuple[str, str]:
-        color = self.app.theme_variables["warning"]
-        background = self.app.theme_variables["background"]
-        return color, background
+    def set_palette(self, palette: Palette) -> None:
+        super().set_palette(palette)
+        self.frames = light_frames(
+            palette.style("error", "background"),
+            palette.style("warning", "warning-darken-3"),
+        )
 
-    def reload(self) -> None:
-        if randint(0, 2):
+    def advance_animation(self) -> None:
+        if self.rng.randint(0, 2):
             return
+        self.set_index(self.animation.get_random_index(self.rng))
+
+    def set_index(self, index: int) -> None:
+        if index != self.index:
+            self.index = index
+            self.mark_dirty()
 
-        new_frame = self.render()
-        if new_frame != self.curr_frame:
-            self.curr_frame = new_frame
-            self.update(new_frame)
+    def snapshot(self) -> Any:
+        return self.rng.getstate(), self.index
+
+    def restore(self, state: Any) -> None:
+        super().restore(state)
+        rng_state, index = state
+        self.rng.setstate(rng_state)
+        self.set_index(index)
 
     def render(self) -> RenderResult:
-        vars = self.app.theme_variables
-        text = Text()
-        text.append(
-            self.animation.get_random_frame(),
-            style=Style(color=vars["error"], bgcolor=vars["background"]),
-        )
-        text.append(
-            "🬗", style=Style(color=vars["warning"], bgcolor=vars["warning-darken-3"])
-        )
-        return text
+        if not self.frames:
+            return ""
+        return self.frames[self.index]
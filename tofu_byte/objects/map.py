@@ -1,11 +1,13 @@
 from dataclasses import dataclass
+import hashlib
 import json
 from pathlib import Path
 
 from textual.geometry import Offset
 
-from tofu_byte.config import APP_AUTHOR, GAME_VERSION
+from tofu_byte.config import APP_AUTHOR, GAME_VERSION, PROJECT_DIR
 from tofu_byte.objects.base_object import BaseObject
+from tofu_byte.objects.compiled_map import read_compiled_map, summarize_objects
 from tofu_byte.type_register import CLASS_REGISTRY
 
 
@@ -52,19 +54,48 @@ def load_json(file_name: Path) -> dict[Any, Any]:
     return config
 
 
+def read_map(file_name: Path) -> dict[Any, Any]:
+    # Compiled map when it is there and up to date, JSON otherwise
+    map_config = read_compiled_map(file_name)
+    if map_config is None:
+        map_config = load_json(file_name)
+    return map_config
+
+
+def map_key(file_name: Path) -> str:
+    # Bundled maps by their place in the package, the same after a reinstall
+    file_name = file_name.resolve()
+    if file_name.is_relative_to(PROJECT_DIR):
+        file_name = file_name.relative_to(PROJECT_DIR)
+    return file_name.as_posix()
+
+
+def map_hash(file_name: Path) -> str:
+    # Changes with every edit of the map, identifies it for scores and ghosts
+    return hashlib.sha1(file_name.read_bytes()).hexdigest()
+
+
+def load_config_values(map_config: dict[Any, Any]) -> MapConfigValues:
+    summary = map_config.get("summary") or summarize_objects(map_config["objects"])
+    return MapConfigValues(
+        hp=map_config["hp"],
+        points=summary["points"],
+        winning_ball=summary["winning_ball"],
+        map_size=Offset(64, 64),
+    )
+
+
 def load_map(
     file: Path,
+    map_config: dict[Any, Any] | None = None,
 ) -> MapData:
-    map_config = load_json(file)
+    # `map_config` is the already read content of `file`
+    if map_config is None:
+        map_config = read_map(file)
     objects = [
         CLASS_REGISTRY[obj["type"]].from_json(obj) for obj in map_config["objects"]
     ]
-    config = MapConfigValues(
-        hp=map_config["hp"],
-        points=sum(obj["type"] == "Star" for obj in map_config["objects"]),
-        winning_ball=any(obj["type"] == "EndBall" for obj in map_config["objects"]),
-        map_size=Offset(64, 64),
-    )
+    config = load_config_values(map_config)
     metadata = MapMetadata(
         map_config.get("name", file.stem),
         map_config.get("game_version", GAME_VERSION),
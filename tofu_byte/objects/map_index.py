@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from tofu_byte.config import APP_AUTHOR, GAME_VERSION, user_dir
+from tofu_byte.objects.map import read_map
+
+INDEX_FILE = user_dir / "map_index.json"
+INDEX_VERSION = 1
+
+
+@dataclass
+class MapInfo:
+    name: str
+    authors: list[str]
+    game_version: str
+    objects: int
+    stars: int
+    width: int
+    height: int
+
+    def describe(self) -> str:
+        return (
+            f"{self.name} by {', '.join(self.authors)} (v{self.game_version})\n"
+            f"{self.width}x{self.height}, {self.objects} objects, {self.stars} stars"
+        )
+
+
+def map_info(file: Path, map_config: dict[Any, Any]) -> MapInfo:
+    objects = map_config["objects"]
+    width = height = 0
+    for obj in objects:
+        x, y = [*obj["pos"], 0, 0][:2]
+        w, h = [*obj.get("size", []), 1, 1][:2]
+        width = max(width, x + w)
+        height = max(height, y + h)
+    return MapInfo(
+        map_config.get("name", file.stem),
+        map_config.get("authors", [APP_AUTHOR]),
+        map_config.get("game_version", GAME_VERSION),
+        len(objects),
+        sum(obj["type"] == "Star" for obj in objects),
+        width,
+        height,
+    )
+
+
+class MapIndex:
+    """Folder listings and map metadata, kept in `user_dir` between runs.
+
+    Entries are valid while the mtime of the folder or map matches, so only
+    changed ones are read again. Entries of deleted or renamed paths are
+    dropped when their folder is listed again.
+    """
+
+    def __init__(self, file: Path = INDEX_FILE) -> None:
+        self.file = file
+        self.lock = Lock()
+        self.changed = False
+        # Folder -> {"mtime_ns", "children": [[name, is_dir], ...]}
+        self.dirs: dict[str, dict[str, Any]] = {}
+        # Map -> {"mtime_ns", "size", "info": MapInfo fields}
+        self.maps: dict[str, dict[str, Any]] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.file.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.dirs = data.get("dirs", {})
+        self.maps = data.get("maps", {})
+
+    def save(self) -> None:
+        with self.lock:
+            if not self.changed:
+                return
+            data = json.dumps(
+                {"version": INDEX_VERSION, "dirs": self.dirs, "maps": self.maps}
+            )
+            self.changed = False
+        try:
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+            self.file.write_text(data)
+        except OSError:
+            pass
+
+    def children(self, path: Path) -> list[tuple[str, bool]]:
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            with self.lock:
+                if self.dirs.pop(str(path), None) is not None:
+                    self.changed = True
+                self.forget(path, set())
+            return []
+        entry = self.dirs.get(str(path))
+        if entry is not None and entry["mtime_ns"] == mtime_ns:
+            return [(name, is_dir) for name, is_dir in entry["children"]]
+        children = [(p.name, p.is_dir()) for p in path.iterdir()]
+        with self.lock:
+            self.dirs[str(path)] = {"mtime_ns": mtime_ns, "children": children}
+            self.forget(path, {name for name, _ in children})
+            self.changed = True
+        return children
+
+    def forget(self, folder: Path, names: set[str]) -> None:
+        # Drops entries inside `folder` that are not under one of `names`,
+        # called with the lock held
+        for entries in (self.dirs, self.maps):
+            for key in list(entries):
+                path = Path(key)
+                if path.is_relative_to(folder) and path != folder:
+                    if path.relative_to(folder).parts[0] not in names:
+                        del entries[key]
+                        self.changed = True
+
+    def info(self, file: Path) -> MapInfo | None:
+        # Cached metadata, None when it is missing or the map changed
+        try:
+            stat = file.stat()
+        except OSError:
+            return None
+        entry = self.maps.get(str(file))
+        if (
+            entry is None
+            or entry["mtime_ns"] != stat.st_mtime_ns
+            or entry["size"] != stat.st_size
+        ):
+            return None
+        return MapInfo(**entry["info"])
+
+    def refresh(self, file: Path) -> MapInfo | None:
+        info = self.info(file)
+        if info is not None:
+            return info
+        try:
+            stat = file.stat()
+            info = map_info(file, read_map(file))
+        except FileNotFoundError:
+            with self.lock:
+                if self.maps.pop(str(file), None) is not None:
+                    self.changed = True
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        with self.lock:
+            self.maps[str(file)] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "info": asdict(info),
+            }
+            self.changed = True
+        return info
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from math import ceil, floor
+from pathlib import Path
+from typing import Any
+
+from tofu_byte.config import user_dir
+
+THUMBNAILS_DIR = user_dir / "thumbnails"
+# Part of the cache key, bump it when the drawing changes
+THUMBNAIL_VERSION = 2
+THUMBNAIL_SIZE = (40, 10)
+
+# KillingBondary is left out, it kills outside its rectangle and the
+# rectangle is the whole level, it still counts for the map size
+SOLID_TYPES = {"Floor", "Spikes", "SpikesDown"}
+MARKERS = {"Star": "*", "EndBall": "●", "Player": "■"}
+# Top and bottom half of a cell filled
+HALF_BLOCKS = {
+    (False, False): " ",
+    (True, False): "▀",
+    (False, True): "▄",
+    (True, True): "█",
+}
+
+
+def thumbnail(map_config: dict[Any, Any], width: int, height: int) -> str:
+    # Every cell holds two pixels, one above the other, so one map cell
+    # is one pixel wide and two pixels high before scaling
+    objects = map_config["objects"]
+    rects: list[tuple[str, int, int, int, int]] = []
+    for obj in objects:
+        x, y = [*obj["pos"], 0, 0][:2]
+        w, h = [*obj.get("size", []), 1, 1][:2]
+        rects.append((obj["type"], x, y, w, h))
+    map_width = max([x + w for _, x, _, w, _ in rects], default=1)
+    map_height = max([y + h for _, _, y, _, h in rects], default=1)
+    scale = min(width / map_width, height / map_height, 1)
+    columns = max(1, ceil(map_width * scale))
+    rows = max(1, ceil(map_height * scale))
+
+    pixels = [[False] * columns for _ in range(rows * 2)]
+    for type_name, x, y, w, h in rects:
+        if type_name not in SOLID_TYPES:
+            continue
+        top = max(floor(y * scale * 2), 0)
+        bottom = min(ceil((y + h) * scale * 2), rows * 2)
+        left = max(floor(x * scale), 0)
+        right = min(ceil((x + w) * scale), columns)
+        for row in pixels[top:bottom]:
+            row[left:right] = [True] * max(right - left, 0)
+
+    cells = [
+        [HALF_BLOCKS[pair] for pair in zip(pixels[2 * i], pixels[2 * i + 1])]
+        for i in range(rows)
+    ]
+    for type_name, x, y, _, _ in rects:
+        marker = MARKERS.get(type_name)
+        if marker is not None:
+            column = min(max(floor(x * scale), 0), columns - 1)
+            cells[min(max(floor(y * scale), 0), rows - 1)][column] = marker
+    return "\n".join("".join(row) for row in cells)
+
+
+def cached_thumbnail(file: Path, size: tuple[int, int] = THUMBNAIL_SIZE) -> str:
+    # Cached by content, so copies of a map share the file
+    source = file.read_bytes()
+    key = hashlib.sha1(source)
+    key.update(f"{THUMBNAIL_VERSION}:{size[0]}x{size[1]}".encode())
+    cache_file = THUMBNAILS_DIR / f"{key.hexdigest()}.txt"
+    try:
+        return cache_file.read_text(encoding="utf-8")
+    except OSError:
+        pass
+    preview = thumbnail(json.loads(source), *size)
+    try:
+        THUMBNAILS_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(preview, encoding="utf-8")
+    except OSError:
+        pass
+    return preview
@@ -6,42 +6,18 @@ from tofu_byte.player.collision import CollisionEvent, Side
 from tofu_byte.type_register import register
 from tofu_byte.mystatic import MyText
 
-from .base_object import BaseObject
+from .base_object import BaseObject, ObjectLogic
 
 from typing import Any
-from textual.geometry import Offset, Size
+from textual.geometry import Offset, Region, Size
 
 
-@register
-class Spikes(BaseObject):
-    type_name = "Spikes"
+class SpikesLogic(ObjectLogic):
     blocks: bool = True
     triggers: bool = True
-    icon = ["◢", "◣"]
     max_size = Size(-1, 1)
     contact_direction = Side.BOTTOM
 
-    def __init__(
-        self,
-        pos: Offset = Offset(0, 0),
-        size: Size = Size(4, 1),
-        *args: Any,
-        **kwargs: Any,
-    ) -> None:
-        super().__init__(pos, size, *args, **kwargs)
-
-    def render(self) -> RenderResult:
-        style = self.set_colors()
-        return MyText(
-            f"{self.icon[0]}{self.icon[1]}" * (self.m_size.width // 2),
-            style=style,
-        )
-
-    def default_colors(self) -> tuple[str, str]:
-        color = self.app.theme_variables["warning"]
-        background = self.app.theme_variables["background"]
-        return color, background
-
     def occupies_dead_zone(self, pos: Offset):
         return (
             self.pos.x + 1 <= pos.x < self.pos.x + self.m_size.width - 1
@@ -57,6 +33,12 @@ class Spikes(BaseObject):
     def occupies_tile(self, pos: Offset) -> bool:
         return self.occupies_spike_zone(pos) or self.occupies_dead_zone(pos)
 
+    def collision_region(self) -> Region | None:
+        # Dead zone is one tile above (or below for SpikesDown) the spikes
+        return Region(
+            self.pos.x, self.pos.y - 1, self.m_size.width, self.m_size.height + 2
+        )
+
     def blocks_movement(self, event: CollisionEvent) -> bool:
         if self.occupies_dead_zone(event.target_pos):
             return False
@@ -65,10 +47,10 @@ class Spikes(BaseObject):
     def on_collision(self, event: CollisionEvent) -> None:
         super().on_collision(event)
 
-        if self.occupies_dead_zone(event.player.offset):
+        if self.occupies_dead_zone(event.player.position):
             event.player.damage()
             return
-        if self.occupies_spike_zone(event.player.offset):
+        if self.occupies_spike_zone(event.player.position):
             event.player.damage()
             return
         if self.occupies_spike_zone(event.target_pos) and event.side in [
@@ -78,10 +60,7 @@ class Spikes(BaseObject):
             return
 
 
-@register
-class SpikesDown(Spikes):
-    type_name = "SpikesDown"
-    icon = ["◥", "◤"]
+class SpikesDownLogic(SpikesLogic):
     contact_direction = Side.TOP
 
     def occupies_dead_zone(self, pos: Offset):
@@ -89,3 +68,32 @@ class SpikesDown(Spikes):
             self.pos.x + 1 <= pos.x < self.pos.x + self.m_size.width - 1
             and self.pos.y <= pos.y < self.pos.y - 1
         )
+
+
+@register
+class Spikes(SpikesLogic, BaseObject):
+    type_name = "Spikes"
+    icon = ["◢", "◣"]
+    theme_colors: tuple[str, str] = ("error", "background")
+
+    def __init__(
+        self,
+        pos: Offset = Offset(0, 0),
+        size: Size = Size(4, 1),
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(pos, size, *args, **kwargs)
+
+    def render(self) -> RenderResult:
+        style = self.set_colors()
+        return MyText(
+            f"{self.icon[0]}{self.icon[1]}" * (self.m_size.width // 2),
+            style=style,
+        )
+
+
+@register
+class SpikesDown(SpikesDownLogic, Spikes):
+    type_name = "SpikesDown"
+    icon = ["◥", "◤"]
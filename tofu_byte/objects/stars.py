@@ -1,28 +1,46 @@
 from __future__ import annotations
 
+from copy import copy
+
 from textual.app import RenderResult
 from textual.geometry import Offset, Size
 
 from tofu_byte.game.events import EndBallCollected, PointCollected
-from tofu_byte.objects.faze import Faze
+from tofu_byte.objects.faze import Faze, styled_frames
 from tofu_byte.player.collision import CollisionEvent
 from tofu_byte.type_register import register
 from tofu_byte.mystatic import MyText
-from .base_object import BaseObject
-from random import randint
+from tofu_byte.tools.rng import object_random
+from .base_object import BaseObject, ObjectLogic
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     pass
 
 
-@register
-class Star(BaseObject):
-    type_name = "Star"
+class StarLogic(ObjectLogic):
     blocks: bool = False
     triggers: bool = True
+
+    def on_collision(self, event: CollisionEvent) -> None:
+        self.post_message(PointCollected(1))
+        self.should_remove = True
+
+
+class EndBallLogic(StarLogic):
+    def on_collision(self, event: CollisionEvent) -> None:
+        self.post_message(EndBallCollected())
+        event.player.win()
+        self.should_remove = True
+
+
+@register
+class Star(StarLogic, BaseObject):
+    type_name = "Star"
     resizeble: bool = False
-    frames: list[str] = ["▪", "◆"]
+    animated: bool = True
+    frames: tuple[str, ...] = ("▪", "◆")
+    theme_colors: tuple[str, str] = ("success", "background")
 
     def __init__(
         self,
@@ -32,49 +50,57 @@ class Star(BaseObject):
         **kwargs: Any,
     ):
         super().__init__(pos, size, *args, **kwargs)
+        self.rng = object_random()
         self.animation = Faze(
             0,
-            randint(10, 20),
-            self.frames,
+            self.rng.randint(10, 20),
+            list(self.frames),
         )
+        self.index = self.animation.get_index()
         self.update(self.render())
 
-    def default_colors(self) -> tuple[str, str]:
-        color = self.app.theme_variables["success"]
-        background = self.app.theme_variables["background"]
-        return color, background
+    @property
+    def symbol(self) -> str:
+        return self.frames[self.index]
+
+    def set_index(self, index: int) -> None:
+        if index != self.index:
+            self.index = index
+            self.mark_dirty()
 
-    def reload(self):
-        if randint(0, 2):
+    def advance_animation(self) -> None:
+        if self.rng.randint(0, 2):
             return
+        self.set_index(self.animation.get_index())
 
-        new_frame = self.render()
-        if new_frame != self.curr_frame:
-            self.curr_frame = new_frame
-            self.update(new_frame)
+    def snapshot(self) -> Any:
+        return self.rng.getstate(), copy(self.animation), self.index
 
-    def on_collision(self, event: CollisionEvent) -> None:
-        self.post_message(PointCollected(1))
-        self.should_remove = True
+    def restore(self, state: Any) -> None:
+        super().restore(state)
+        rng_state, animation, index = state
+        self.rng.setstate(rng_state)
+        self.animation = copy(animation)
+        self.set_index(index)
 
     def render(self) -> RenderResult:
         style = self.set_colors()
-        return MyText(self.animation.get_frame(), style=style)
+        if style is None:
+            return styled_frames(self.frames)[self.index]
+        return MyText(self.symbol, style=style)
 
 
 @register
-class EndBall(Star):
+class EndBall(EndBallLogic, Star):
     type_name = "EndBall"
-    blocks: bool = False
-    triggers: bool = True
     resizeble: bool = False
-    frames: list[str] = [
+    frames: tuple[str, ...] = (
         "🬖🬅",
         "🬋🬋",
         "🬈🬢",
         "🬉🬓",
         "🬦🬄",
-    ]
+    )
 
     def __init__(
         self,
@@ -87,17 +113,10 @@ class EndBall(Star):
         self.animation = Faze(
             0,
             25,
-            self.frames,
+            list(self.frames),
         )
+        self.index = self.animation.get_index()
         self.update(self.render())
 
-    def reload(self):
-        new_frame = self.render()
-        if new_frame != self.curr_frame:
-            self.curr_frame = new_frame
-            self.update(new_frame)
-
-    def on_collision(self, event: CollisionEvent) -> None:
-        self.post_message(EndBallCollected())
-        event.player.win()
-        self.should_remove = True
+    def advance_animation(self) -> None:
+        self.set_index(self.animation.get_index())
@@ -1,9 +1,9 @@
-from typing import TYPE_CHECKING, List, Union
+from functools import cache
+from typing import TYPE_CHECKING, Union
 
-from rich.style import Style
 from textual.geometry import Offset
 
-from tofu_byte.mystatic import MyText
+from tofu_byte.objects.faze import styled_frames
 from tofu_byte.tools.tools import Direction
 
 if TYPE_CHECKING:
@@ -18,35 +18,47 @@ def only_y(vector: Offset):
     return Offset(0, vector.y)
 
 
+@cache
+def frame_indices(max_frame: int, count: int) -> tuple[int, ...]:
+    return tuple((frame * count) // max_frame for frame in range(max_frame))
+
+
 class State:
+    """One state of the player, created once per player and reused.
+
+    Animation tables are shared by the class, `enter` resets what a state
+    keeps for a single visit.
+    """
+
     max_frame: int
-    animation: List[str]
+    animation: tuple[str, ...]
+    indices: tuple[int, ...]
     frame: Union[int, None] = 0
     direction: Offset = Offset(0, 0)
     immortal: bool = False
-
-    def __init__(
-        self,
-        player: "Player",
-        max_frame: int,
-        animation: List[str],
-        frame: int = 0,
-        direction: Offset = Offset(0, 0),
-    ) -> None:
+    # False when transitions never look at `frame`, visits that only differ
+    # in it play the same, see `Solver`
+    timed: bool = True
+    # Index of the frame returned by the last `get_frame`
+    shown: int = 0
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+        if "animation" in cls.__dict__ or "max_frame" in cls.__dict__:
+            cls.indices = frame_indices(cls.max_frame, len(cls.animation))
+
+    def __init__(self, player: "Player") -> None:
         self.player = player
-        self.max_frame = max_frame
-        self.animation = animation
-        self.frame = frame
-        self.direction = direction
 
     def enter(self):
-        pass
+        self.frame = 0
+        self.shown = 0
 
     def exit(self):
         pass
 
     def update(self):
-        self.player.offset += self.player.new_pos
+        self.player.position += self.player.new_pos
 
     def handle_input(self, directions_set: set[Direction]):
         offset_for_move = Offset(0, 0)
@@ -58,21 +70,24 @@ class State:
             self.player.velocity = only_y(self.player.velocity) + offset_for_move
 
     def show(self, invert_color: int = False):
-        bottom, top = self.player.color, self.player.color_sc
+        style = self.player.frame_style
         if invert_color:
-            bottom, top = self.player.color_sc, self.player.color
+            style = self.player.inverted_style
 
-        new_frame = MyText(self.get_frame(), style=Style(color=bottom, bgcolor=top))
-        if self.player.curr_frame != new_frame:
-            self.player.update(new_frame)
+        # Frames are advanced by the game loop, showing them has no side effects
+        frames = styled_frames(self.animation, style)
+        new_frame = frames[self.shown]
+        if self.player.curr_frame is not new_frame:
+            self.player.show_frame(new_frame)
 
     def get_frame(self):
         if self.frame is None:
+            self.shown = 0
             return self.animation[0]
 
         if self.frame >= self.max_frame:
             self.frame = 0
 
-        frame = self.animation[(self.frame * len(self.animation)) // self.max_frame]
+        self.shown = self.indices[self.frame]
         self.frame += 1
-        return frame
+        return self.animation[self.shown]
@@ -10,9 +10,9 @@ from tofu_byte.tools.tools import Direction
 
 
 if TYPE_CHECKING:
-    from tofu_byte.objects.base_object import BaseObject
-    from tofu_byte.player.player import Player
-    from tofu_byte.game.game import Scene
+    from tofu_byte.objects.base_object import ObjectLogic
+    from tofu_byte.player.player import PlayerLogic
+    from tofu_byte.game.game import SceneLogic
 
 
 # TODO: Remove
@@ -36,8 +36,8 @@ class Side(Enum):
 
 
 class CollisionEvent(NamedTuple):
-    player: Player
-    obj: BaseObject
+    player: PlayerLogic
+    obj: ObjectLogic
     side: Side
     target_pos: Offset
 
@@ -45,8 +45,8 @@ class CollisionEvent(NamedTuple):
 class Collision:
     collision_number = 0
 
-    def __init__(self, mediator: Scene) -> None:
-        self.mediator: Scene = mediator
+    def __init__(self, mediator: SceneLogic) -> None:
+        self.mediator: SceneLogic = mediator
 
     def _compute_side(self, v: Offset) -> Side:
         if abs(v.x) > abs(v.y):
@@ -55,21 +55,31 @@ class Collision:
             return Side.BOTTOM if v.y > 0 else Side.TOP
 
     def _collision(
-        self, player: Player, offset: Offset, velocity: Offset
+        self, player: PlayerLogic, offset: Offset, velocity: Offset
     ) -> set[CollisionEvent]:
         new_pos = offset + velocity
         collisions: set[CollisionEvent] = set()
+        side = self._compute_side(velocity)
 
-        self.collision_number += len(self.mediator.colliders)
-        for obj in self.mediator.colliders:
+        occupancy = self.mediator.occupancy
+        if occupancy is not None and occupancy.covers(new_pos):
+            # Owners of a baked cell are known to occupy it, empty cells
+            # only leave the objects without bounds to check
+            for obj in occupancy.owners_at(new_pos):
+                collisions.add(CollisionEvent(player, obj, side, new_pos))
+            candidates = occupancy.unbounded
+        else:
+            candidates = self.mediator.spatial_index.query(new_pos)
+
+        self.collision_number += len(collisions) + len(candidates)
+        for obj in candidates:
             if obj.occupies_tile(new_pos):
-                side = self._compute_side(velocity)
                 collisions.add(CollisionEvent(player, obj, side, new_pos))
         return collisions
 
-    def gather_collisions(self, player: Player) -> set[CollisionEvent]:
+    def gather_collisions(self, player: PlayerLogic) -> set[CollisionEvent]:
         v = player.velocity
-        offset = player.offset
+        offset = player.position
 
         collisions: set[CollisionEvent] = set()
 
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from enum import Enum, auto
+from rich.style import Style
 from textual.app import ComposeResult
 from textual.geometry import Offset
-from typing import Any
+from typing import Any, Callable
 from textual import events
+from textual.message import Message
 from textual.widgets import Input
 
 
@@ -16,8 +17,9 @@ from tofu_byte.game.events import (
     PlayerMouseDown,
 )
 from tofu_byte.mystatic import GameObjectStatic
-from tofu_byte.objects.state import State
-from tofu_byte.screens.game_display import LabeledInput
+from tofu_byte.objects.state import State, frame_indices
+from tofu_byte.objects.shared_widgets import LabeledInput
+from tofu_byte.themes import Palette
 from tofu_byte.tools.const import BACKGROUND
 from tofu_byte.mystatic import MyText
 from tofu_byte.type_register import register
@@ -25,7 +27,7 @@ from tofu_byte.type_register import register
 from ..tools.loggerr import get_textlog
 
 from .collision import Collision, CollisionEvent, Side
-from ..objects.base_object import BaseObject
+from ..objects.base_object import BaseObject, MouseState
 
 from ..tools.tools import Direction
 
@@ -34,13 +36,6 @@ from typing import Set
 directions = {"l": Offset(-1, 0), "r": Offset(1, 0)}
 
 
-class MouseState(Enum):
-    MOUSE_DOWN = auto()
-    MOUSE_UP_AFTER_DRAGGING = auto()
-    MOUSE_DRAGGING = auto()
-    NO_MOUSE = auto()
-
-
 @dataclass
 class PlayerParameters:
     type: str
@@ -50,221 +45,232 @@ class PlayerParameters:
 
 class EditState(State):
     immortal: bool = True
-
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 27, ["▄", "▃"], direction=Offset(0, 1))
+    timed: bool = False
+    max_frame = 27
+    animation = ("▄", "▃")
+    direction = Offset(0, 1)
 
 
 class StartState(State):
     immortal: bool = True
-
-    def __init__(self, player: Player) -> None:
-        blocks = [
-            "🬞",
-            "🬏",
-            "🬖",
-            "🬢",
-            "🬗",
-            "🬤",
-            "🬗",
-            "🬤",
-            "🬧",
-            "🬔",
-            "▐",
-            "🬷",
-            "🬻",
-            "█",
-            "🬎",
-            "▀",
-            "🮃",
-            "🮂",
-        ]
-        super().__init__(player, len(blocks) * 2, blocks)
+    animation = (
+        "🬞",
+        "🬏",
+        "🬖",
+        "🬢",
+        "🬗",
+        "🬤",
+        "🬗",
+        "🬤",
+        "🬧",
+        "🬔",
+        "▐",
+        "🬷",
+        "🬻",
+        "█",
+        "🬎",
+        "▀",
+        "🮃",
+        "🮂",
+    )
+    max_frame = len(animation) * 2
 
     def update(self):
         if self.frame == self.max_frame:
-            self.player.change_state(FallState(self.player))
+            self.player.change_state(FallState)
 
 
 class NoState(State):
     immortal: bool = True
-
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 1, [" "])
+    timed: bool = False
+    max_frame = 1
+    animation = (" ",)
 
     def update(self): ...
 
 
 class DeadState(State):
     immortal: bool = True
-
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 1, [" "])
+    timed: bool = False
+    max_frame = 1
+    animation = (" ",)
 
     def update(self):
         self.player.post_message(EndGame())
-        self.player.change_state(NoState(self.player))
+        self.player.change_state(NoState)
 
 
 class WinState(State):
     immortal: bool = True
-
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 1, ["▀"])
+    timed: bool = False
+    max_frame = 1
+    animation = ("▀",)
 
     def update(self):
         self.player.post_message(EndGame(True))
-        self.player.change_state(NoState(self.player))
+        self.player.change_state(NoState)
 
 
 class DyingState(State):
     immortal: bool = True
-
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 15, ["▙", "▟", "▜", "▀", "▘", "▖"])
+    max_frame = 15
+    animation = ("▙", "▟", "▜", "▀", "▘", "▖")
 
     def update(self):
         if self.frame == self.max_frame:
-            self.player.change_state(DeadState(self.player))
+            self.player.change_state(DeadState)
 
 
 class StayState(State):
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 18, ["▂", "▃", "▄", "▃"], direction=Offset(0, 1))
+    timed: bool = False
+    max_frame = 18
+    animation = ("▂", "▃", "▄", "▃")
+    direction = Offset(0, 1)
 
     def handle_input(self, directions_set: set[Direction]):
         super().handle_input(directions_set)
         if "u" in directions_set:
-            self.player.change_state(PreJumpState(self.player))
+            self.player.change_state(PreJumpState)
             return
         if "l" in directions_set or "r" in directions_set:
-            self.player.change_state(MoveState(self.player))
+            self.player.change_state(MoveState)
 
         if "d" in directions_set:
-            self.player.change_state(CrunchState(self.player))
+            self.player.change_state(CrunchState)
 
     def update(self):
         super().update()
         if not self.player.is_on_ground:
-            self.player.change_state(FallState(self.player))
+            self.player.change_state(FallState)
             return
 
 
 class CrunchState(State):
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 12, ["▁"] * 8 + ["▂"] * 4, direction=Offset(0, 1))
+    max_frame = 12
+    animation = ("▁",) * 8 + ("▂",) * 4
+    direction = Offset(0, 1)
 
     def handle_input(self, directions_set: set[Direction]):
         super().handle_input(directions_set)
         if "u" in directions_set:
-            self.player.change_state(PreJumpState(self.player))
+            self.player.change_state(PreJumpState)
             return
         if "l" in directions_set or "r" in directions_set:
-            self.player.change_state(MoveState(self.player))
+            self.player.change_state(MoveState)
 
     def update(self):
         super().update()
         if not self.player.is_on_ground:
-            self.player.change_state(FallState(self.player))
+            self.player.change_state(FallState)
             return
         if self.frame == self.max_frame:
-            self.player.change_state(StayState(self.player))
+            self.player.change_state(StayState)
 
 
 class MoveState(State):
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 15, ["▂", "▄"], direction=Offset(0, 1))
+    timed: bool = False
+    max_frame = 15
+    animation = ("▂", "▄")
+    direction = Offset(0, 1)
 
     def handle_input(self, directions_set: set[Direction]):
         super().handle_input(directions_set)
         if not directions_set:
-            self.player.change_state(StayState(self.player))
+            self.player.change_state(StayState)
             return
 
         if "u" in directions_set:
-            self.player.change_state(PreJumpState(self.player))
+            self.player.change_state(PreJumpState)
 
     def update(self):
         super().update()
         if not self.player.is_on_ground:
-            self.player.change_state(FallState(self.player))
+            self.player.change_state(FallState)
         if self.player.velocity.x == 0:
-            self.player.change_state(StayState(self.player))
+            self.player.change_state(StayState)
 
 
 class PostFallState(State):
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 2, ["╻", "▂"], direction=Offset(0, 1))
+    max_frame = 2
+    animation = ("╻", "▂")
+    direction = Offset(0, 1)
 
     def handle_input(self, directions_set: set[Direction]):
         super().handle_input(directions_set)
         if "u" in directions_set:
-            self.player.change_state(PreJumpState(self.player))
+            self.player.change_state(PreJumpState)
             return
         if "l" in directions_set or "r" in directions_set:
-            self.player.change_state(MoveState(self.player))
+            self.player.change_state(MoveState)
 
     def update(self):
         super().update()
         if not self.player.is_on_ground:
-            self.player.change_state(FallState(self.player))
+            self.player.change_state(FallState)
             return
         if self.frame == self.max_frame:
-            self.player.change_state(StayState(self.player))
+            self.player.change_state(StayState)
             return
 
 
 class FallState(State):
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 1, ["┃"], direction=Offset(0, 1))
+    timed: bool = False
+    max_frame = 1
+    animation = ("┃",)
+    direction = Offset(0, 1)
 
     def update(self):
         super().update()
         if self.player.is_on_ground:
-            self.player.change_state(PostFallState(self.player))
+            self.player.change_state(PostFallState)
 
 
 class PreJumpState(State):
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 6, ["▂", "╻", "┃"], direction=Offset(0, 0))
-        # super().__init__(player, 15, ["▂", "╻", "┃"], direction=Offset(0, 0)) # previous version
+    # max_frame = 15 # previous version
+    max_frame = 6
+    animation = ("▂", "╻", "┃")
 
     def update(self):
         super().update()
         if self.frame == self.max_frame:
-            self.player.change_state(JumpState(self.player))
+            self.player.change_state(JumpState)
 
 
 class JumpState(State):
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 4, ["┃"], direction=Offset(0, -1))
+    max_frame = 4
+    animation = ("┃",)
+    direction = Offset(0, -1)
 
     def update(self):
         super().update()
         if self.frame == self.max_frame:
-            self.player.change_state(TopState(self.player))
+            self.player.change_state(TopState)
         if self.player.is_on_roof is True:
-            self.player.change_state(RoofState(self.player))
+            self.player.change_state(RoofState)
 
 
 class TopState(State):
-    def __init__(self, player: Player) -> None:
-        super().__init__(player, 5, ["┃", "╹", "🮂", "🮂", "╹"], direction=Offset(0, 0))
-        # super().__init__(player, 5, ["▂"], direction=Offset(0, 0)) # previous version
+    # animation = ("▂",) # previous version
+    max_frame = 5
+    animation = ("┃", "╹", "🮂", "🮂", "╹")
 
     def update(self):
         super().update()
         if self.player.is_on_roof is True:
-            self.player.change_state(RoofState(self.player))
+            self.player.change_state(RoofState)
             return
         if self.frame == self.max_frame:
-            self.player.change_state(FallState(self.player))
+            self.player.change_state(FallState)
 
 
 class RoofState(State):
-    def __init__(self, player: Player) -> None:
-        # super().__init__(player, 12, ["▀", "🮃"], direction=Offset(0, 0)) # previous version
-        super().__init__(player, 9, ["🮃", "▀"], direction=Offset(0, 0))
+    timed: bool = False
+    # max_frame, animation = 12, ("▀", "🮃") # previous version
+    max_frame = 9
+    animation = ("🮃", "▀")
+
+    def enter(self):
+        super().enter()
         self.can_roof_jump = 0
         self.should_fall_down = False
 
@@ -279,22 +285,28 @@ class RoofState(State):
     def update(self):
         super().update()
         if self.should_fall_down:
-            self.player.change_state(FallState(self.player))
+            self.player.change_state(FallState)
             return
         # if self.can_roof_jump is True and self.player.is_on_roof is True:
-        #     self.player.change_state(RoofCoyoteState(self.player))
+        #     self.player.change_state(RoofCoyoteState)
         if self.player.is_on_roof is False:
-            self.player.change_state(RoofCoyoteState(self.player, self.can_roof_jump))
+            self.player.change_state(RoofCoyoteState, self.can_roof_jump)
             return
 
 
 class RoofCoyoteState(State):
-    def __init__(self, player: Player, can_roof_jump: int = 0) -> None:
-        # super().__init__(player, 15, ["🮆", "▀", "🮃"], direction=Offset(0, 0))  # previous version
-        super().__init__(player, 4 + can_roof_jump, ["🮃", "🮂"], direction=Offset(0, 0))
+    # max_frame, animation = 15, ("🮆", "▀", "🮃")  # previous version
+    max_frame = 4
+    animation = ("🮃", "🮂")
+
+    def enter(self, can_roof_jump: int = 0):
+        assert can_roof_jump < 3
+        super().enter()
+        # Longer when jump was pressed just before leaving the roof
+        self.max_frame = type(self).max_frame + can_roof_jump
+        self.indices = frame_indices(self.max_frame, len(self.animation))
         self.can_roof_jump = can_roof_jump > 1
         self.should_fall_down = False
-        assert can_roof_jump < 3
 
     def handle_input(self, directions_set: set[Direction]):
         super().handle_input(directions_set)
@@ -306,58 +318,29 @@ class RoofCoyoteState(State):
     def update(self):
         super().update()
         if self.should_fall_down:
-            self.player.change_state(FallState(self.player))
+            self.player.change_state(FallState)
             return
 
         if self.frame != self.max_frame:
             return
 
         if self.player.is_on_roof is True:
-            self.player.change_state(RoofState(self.player))
+            self.player.change_state(RoofState)
             return
         if self.can_roof_jump:
-            self.player.change_state(JumpState(self.player))
+            self.player.change_state(JumpState)
             return
-        self.player.change_state(FallState(self.player))
+        self.player.change_state(FallState)
 
 
-@register
-class Player(GameObjectStatic):
-    type_name = "Player"
+class PlayerLogic:
+    """Movement and state machine of the player, shared with headless models."""
 
-    def __init__(
-        self,
-        start_pos: Offset = Offset(1, 1),
-        layer_number: int = 2,
-        *args: Any,
-        **kwargs: Any,
-    ) -> None:
-        super().__init__()
-        self.layer_number = layer_number
-        self.should_remove = False
-        self.editable = False
-        self.curr_frame = MyText()
-
-        self.coliders: Set[BaseObject] = set()
-        self.collision_directions: set[Direction] = set()
-        self.effects_list = []
-
-        self.direction_set: Set[Direction] = set()
-        self.move_blocker: int = 0
-        self.hue = 0
-        self.starting_pos = start_pos
-
-        self.collision = Collision(self)
-        self.set_player(start_pos)
-        self.styles.layer = f"a{self.layer_number}{self.type_name}"
-
-        self.on_roof = False
-        self.color = "red"
-        self.color_sc = BACKGROUND
-        # self.styles.color = self.color
-        # self.styles.background = self.color_sc
-        self.textlog = get_textlog()
-        self.mouse_state = MouseState.NO_MOUSE
+    starting_pos: Offset
+    # Where the game puts the player, widgets show it at `offset`
+    position: Offset
+    should_remove: bool
+    post_message: Callable[[Message], bool]
 
     def set_player(self, pos: Offset) -> None:
         self.end_facing: Offset = Offset(0, 0)
@@ -366,8 +349,11 @@ class Player(GameObjectStatic):
         self.pos: Offset = pos
         self.alive = True
         self.collision_directions = set()
-        self.offset = pos
-        self.state: State = StartState(self)
+        self.position = pos
+        if not hasattr(self, "states"):
+            self.states: dict[type[State], State] = {}
+        self.state: State = self.get_state(StartState)
+        self.state.enter()
         self.velocity: Offset = Offset(0, 0)
         self.is_on_ground = False
         self.is_on_roof = False
@@ -379,8 +365,17 @@ class Player(GameObjectStatic):
         self.facing = Offset(0, 0)
         self.velocity = Offset(0, 0) + self.state.direction
 
-    def change_state(self, new_state: State):
-        self.state = new_state
+    def get_state(self, state_type: type[State]) -> State:
+        state = self.states.get(state_type)
+        if state is None:
+            state = self.states[state_type] = state_type(self)
+        return state
+
+    def change_state(self, state_type: type[State], *args: Any) -> None:
+        # States are reused, `enter` starts a new visit
+        self.state.exit()
+        self.state = self.get_state(state_type)
+        self.state.enter(*args)
 
     def handle_input(self, directions_set: set[Direction]):
         self.state.handle_input(directions_set)
@@ -409,29 +404,66 @@ class Player(GameObjectStatic):
         elif side == Side.LEFT or side == Side.RIGHT:
             self.velocity = Offset(0, self.velocity.y)
 
-    def show(self) -> None:
-        self.state.show()
-
     def damage(self) -> None:
         if not self.state.immortal:
-            self.change_state(DyingState(self))
+            self.change_state(DyingState)
             self.post_message(HpChange(-1))
 
     def win(self) -> None:
-        self.change_state(WinState(self))
+        self.change_state(WinState)
+
+
+@register
+class Player(PlayerLogic, GameObjectStatic):
+    type_name = "Player"
+
+    def __init__(
+        self,
+        start_pos: Offset = Offset(1, 1),
+        layer_number: int = 2,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__()
+        self.layer_number = layer_number
+        self.should_remove = False
+        self.editable = False
+        self.curr_frame = MyText()
+
+        self.coliders: Set[BaseObject] = set()
+        self.collision_directions: set[Direction] = set()
+        self.effects_list = []
+
+        self.direction_set: Set[Direction] = set()
+        self.move_blocker: int = 0
+        self.starting_pos = start_pos
+
+        self.collision = Collision(self)
+        self.set_player(start_pos)
+        self.offset = self.position
+        self.styles.layer = f"a{self.layer_number}{self.type_name}"
+
+        self.on_roof = False
+        self.frame_style = Style(color="red", bgcolor=BACKGROUND)
+        self.inverted_style = Style(color=BACKGROUND, bgcolor="red")
+        self.textlog = get_textlog()
+        self.mouse_state = MouseState.NO_MOUSE
+
+    def show(self) -> None:
+        self.offset = self.position
+        self.state.show()
 
-    def change_color(self) -> None:
-        vars = self.app.theme_variables
-        self.hue = (self.hue + 50) % 1000
-        self.color = vars.get("player-color", self.app.theme_variables.get("accent"))
-        self.color_sc = vars["background"]
+    def set_palette(self, palette: Palette) -> None:
+        super().set_palette(palette)
+        self.frame_style = palette.style("player-color", "background")
+        self.inverted_style = palette.style("background", "player-color")
 
     # def my_update(self, content):
     #     self.__content = content
     #     self.__visual = visualize(self, content, markup=self._render_markup)
 
     def edit_state(self):
-        self.state = EditState(self)
+        self.change_state(EditState)
 
     async def on_enter(self, event: events.Enter):
         self.is_entered = True
@@ -462,6 +494,7 @@ class Player(GameObjectStatic):
 
     def move(self, delta: Offset):
         self.pos = self.pos + delta
+        self.position = self.pos
         self.styles.offset = Offset(self.pos.x, self.pos.y)
         self.mouse_state = MouseState.MOUSE_DRAGGING
 
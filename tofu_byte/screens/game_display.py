@@ -1,7 +1,7 @@
 from __future__ import annotations
 from dataclasses import asdict
 import pathlib
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from textual import events, work
 from textual.app import ComposeResult
@@ -33,13 +33,21 @@ from tofu_byte.game.events import (
     PlayerMouseDown,
     PointCollected,
 )
-from tofu_byte.game.input_manager import InputManager, create_input_manager
+from tofu_byte.game.input_manager import (
+    InputManager,
+    create_input_manager,
+    fall_back_to_terminal,
+)
+from tofu_byte.game.terminal_input_manager import TerminalInputManager
+from tofu_byte.game.replay import Replay, ReplayInputManager
+from tofu_byte.game.scores import SCORES, new_score
 from tofu_byte.objects.base_object import BaseObject
+from tofu_byte.objects.compiled_map import compiled_path, write_compiled_map
 from tofu_byte.objects.shared_widgets import LabeledInput
 from tofu_byte.player.player import Player
 from tofu_byte.screens.menu.end_screen import EditEndScreen, EndScreen
 
-from tofu_byte.game.display import Display
+from tofu_byte.game.display import create_display
 
 from tofu_byte.screens.menu.map_loader import MapChain
 from tofu_byte.screens.screens import MenuScreenBase
@@ -109,7 +117,7 @@ class EditorScreenContainer(SceneScreenContainer):
         self.game: Optional[Editor] = None
         super().__init__()
         get_textlog().write(self.focused)
-        self.game_display = Display(classes="editor")
+        self.game_display = create_display(classes="editor")
         self.save_button = Button("Save", id="map_save", variant="success")
         self.download_button = Button(
             "Download map", id="map_download", variant="primary"
@@ -168,6 +176,8 @@ class EditorScreenContainer(SceneScreenContainer):
 
     def animate_list_objects(self):
         for obj in self.objects:
+            if obj.animated:
+                obj.advance_animation()
             obj.reload()
 
     async def mouse_object_focus(self, event: MouseEvent, object: BaseObject | Player):
@@ -228,6 +238,8 @@ class EditorScreenContainer(SceneScreenContainer):
 
         with open(file, "w", encoding="utf-8") as f:
             json.dump(d, f, ensure_ascii=False, indent=2)
+        if compiled_path(file).exists():
+            write_compiled_map(file)
 
         self.notify(f"Map: {file} saved!")
 
@@ -271,20 +283,18 @@ class EditorScreenContainer(SceneScreenContainer):
     async def action_delete_object(self):
         await self.delete_object()
 
-    async def add_new_object(self, event: MouseEvent, object: BaseObject | None = None):
+    async def add_new_object(self, event: MouseEvent):
         if self.game is None:
             return
 
         await self.unfocus_all_objects()
         if not self.tool:
             return
-        correction = Offset(-1, -1)
-        if object is not None:
-            correction = object.offset
 
         new_object = CLASS_REGISTRY[self.tool]
         new_object_instance = new_object(
-            Offset(event.x, event.y) + correction, editable=True
+            event.screen_offset - self.game_display.content_region.offset,
+            editable=True,
         )
         self.mount_drawable(new_object_instance)
         self.game.add_object_to_dicts(new_object_instance)
@@ -299,6 +309,7 @@ class EditorScreenContainer(SceneScreenContainer):
             return
         for object in self.selected_objects:
             object.layer_number = int(event.value)
+        self.game_display.resort_layers()
 
     @on(Input.Changed, "#object_width")
     def on_object_width(self, event: Input.Changed):
@@ -310,6 +321,8 @@ class EditorScreenContainer(SceneScreenContainer):
                 Size(width=int(event.value), height=object.m_size.height),
                 False,
             )
+            if self.game is not None:
+                self.game.reindex_object(object)
 
     @on(Input.Changed, "#object_height")
     def on_object_height(self, event: Input.Changed):
@@ -320,6 +333,8 @@ class EditorScreenContainer(SceneScreenContainer):
                 Size(width=object.m_size.width, height=int(event.value)),
                 False,
             )
+            if self.game is not None:
+                self.game.reindex_object(object)
 
     @on(Input.Changed, "#object_text")
     def on_object_text(self, event: Input.Changed):
@@ -327,6 +342,7 @@ class EditorScreenContainer(SceneScreenContainer):
             if not hasattr(object, "text_value"):
                 continue
             object.text_value = event.value
+            object.mark_dirty()
 
     @on(Button.Pressed, "#map_save")
     def on_map_save(self, event: Button.Pressed):
@@ -403,6 +419,8 @@ class EditorScreenContainer(SceneScreenContainer):
                 object.resize(event.delta, True)
             else:
                 object.move(event.delta)
+            if self.game is not None:
+                self.game.reindex_object(object)
 
     @on(DisplayClicked)
     async def on_display_clicked(self, message: DisplayClicked):
@@ -431,13 +449,13 @@ class EditorScreenContainer(SceneScreenContainer):
             return
 
         if self.tool is not None:
-            await self.add_new_object(event, object)
+            await self.add_new_object(event)
             return
 
         if (
             event.chain == 2
             and len(self.selected_objects) == 1
-            and event.widget == self.selected_objects[0]
+            and object == self.selected_objects[0]
         ):
             await self.unfocus_object(self.selected_objects[0])
             return
@@ -473,7 +491,7 @@ class EditorScreenContainer(SceneScreenContainer):
 
     @on(LayerNumberChange)
     async def on_object_layer_number_change(self, message: LayerNumberChange):
-        self.game_display.resort_layers()
+        self.game_display.update_layer(message.object)
 
     # ===== Handle key events =====
 
@@ -528,14 +546,22 @@ class EditorScreenContainer(SceneScreenContainer):
     def mount_drawable(self, drawable: GameObjectStatic) -> None:
         self.game_display.mount_drawable(drawable)
 
+    def mount_drawables(self, drawables: Iterable[GameObjectStatic]) -> None:
+        self.game_display.mount_drawables(drawables)
+
     def delete_drawable(self, drawable: GameObjectStatic) -> None:
         self.game_display.delete_drawable(drawable)
 
+    def present(self, drawables: Iterable[GameObjectStatic] = ()) -> None:
+        self.game_display.present(drawables)
+
     def stats_clear(self, config: MapConfigValues):
         self.input_hp.value = str(config.hp)
 
 
-class CheckInputSystemScreen(MenuScreenBase[bool]):
+class CheckInputSystemScreen(MenuScreenBase[Optional[bool]]):
+    """Tells if pynput sees the key pressed in the terminal, None if skipped."""
+
     def __init__(self, input_manager: InputManager) -> None:
         self.input_manager = input_manager
         super().__init__()
@@ -551,7 +577,7 @@ class CheckInputSystemScreen(MenuScreenBase[bool]):
         )
 
     def action_go_back(self):
-        self.dismiss(False)
+        self.dismiss(None)
 
     def on_key(self, event: events.Key):
         key_list = [
@@ -570,17 +596,7 @@ class CheckInputSystemScreen(MenuScreenBase[bool]):
             "space",
         ]
         if event.key in key_list:
-            if self.input_manager.is_pressed(key_list):
-                self.dismiss(True)
-            else:
-                self.query_one("#question", Label).update(
-                    (
-                        "Pynput does not work!\n"
-                        "Check troubleshooting to resolve this problem."
-                        "Most likely you need to run terminal with sudo.\n"
-                        "Press <Esc> to come back."
-                    )
-                )
+            self.dismiss(self.input_manager.is_pressed(key_list))
 
 
 class GameScreenContainer(SceneScreenContainer):
@@ -592,19 +608,33 @@ class GameScreenContainer(SceneScreenContainer):
         Binding("c", "stop", "Single step"),
     ]
 
-    def __init__(self, map_chain: MapChain, test_only: bool = False) -> None:
+    def __init__(
+        self,
+        map_chain: MapChain,
+        test_only: bool = False,
+        replay: Replay | None = None,
+    ) -> None:
         self.map_chain = map_chain
         self.game: Optional[Game] = None
+        self.replay = replay
         super().__init__()
         get_textlog().write(self.focused)
-        self.game_display = Display()
+        self.game_display = create_display()
         self.points = Points()
         self.timer = TimeDisplay()
         self.hp_points = LifePoints()
         self.footer = FooterCustom()
 
-        self.input_manager: InputManager = create_input_manager()
-        self.should_check_input_system = should_check_input_system
+        self.input_manager: InputManager
+        if replay is not None:
+            self.input_manager = ReplayInputManager(replay)
+        else:
+            self.input_manager = create_input_manager()
+        self.should_check_input_system = (
+            should_check_input_system
+            and replay is None
+            and self.input_manager.global_hook
+        )
         self.checking_input = False
         self.is_reseting = False
         self.test_only = test_only
@@ -635,6 +665,22 @@ class GameScreenContainer(SceneScreenContainer):
 
     def on_unmount(self):
         self.input_manager.stop()
+        if self.game is not None:
+            self.game.end_game()
+
+    def use_terminal_input(self) -> None:
+        self.input_manager.stop()
+        self.input_manager = fall_back_to_terminal()
+        self.input_manager.start()
+        self.notify(
+            "Pynput does not work, keys are read from the terminal.\n"
+            "See troubleshooting for holding keys smoothly."
+        )
+
+    def on_key(self, event: events.Key) -> None:
+        if isinstance(self.input_manager, TerminalInputManager):
+            if self.input_manager.feed_key(event.key):
+                event.stop()
 
     def update(self):
         self.timer.update_time()
@@ -653,9 +699,11 @@ class GameScreenContainer(SceneScreenContainer):
                 input_system_works = await self.app.push_screen_wait(
                     CheckInputSystemScreen(self.input_manager)
                 )
-                if not input_system_works:
+                if input_system_works is None:
                     self.dismiss()
                     return
+                if not input_system_works:
+                    self.use_terminal_input()
                 await self.action_start(True)
                 self.should_check_input_system = False
                 should_check_input_system = False
@@ -695,8 +743,7 @@ class GameScreenContainer(SceneScreenContainer):
     def action_pause_game(self):
         async def check_if_restart(action: str) -> None:
             if action == "restart":
-                await self.delete_game()
-                self.dismiss(self.map_chain)
+                await self.reset_game()
             elif action == "resume":
                 return
             elif action == "discard":
@@ -710,7 +757,8 @@ class GameScreenContainer(SceneScreenContainer):
         self.app.push_screen("pause_menu", check_if_restart)
 
     async def action_restart_game(self):
-        self.dismiss(self.map_chain)
+        # Same screen, only the map objects are swapped
+        await self.reset_game()
 
     # ===== Game Live =====
 
@@ -723,11 +771,22 @@ class GameScreenContainer(SceneScreenContainer):
             return
         self.timer.stop()
         self.timer.reset()
+        seed = None
+        if isinstance(self.input_manager, ReplayInputManager):
+            self.input_manager.rewind()
+            seed = self.input_manager.replay.seed
         self.game = Game(
             self,
             get_textlog(),
             game_file=self.map_chain.current_map(),
+            map_config=self.map_chain.current_map_config(),
+            seed=seed,
+            record=bool(DEBUG["record"]) and self.replay is None,
+            # Maps tried from the editor change, replays are not own runs
+            ghost=not self.test_only and self.replay is None,
         )
+        # Next level is read while this one is played
+        self.map_chain.prefetch_next()
 
         self.timer.start()
 
@@ -741,6 +800,9 @@ class GameScreenContainer(SceneScreenContainer):
 
     async def end_game(self, win: bool = True):
         get_textlog().write("End game")
+        game = self.game
+        if win and game is not None and game.save_ghost():
+            self.notify("New best run, its ghost joins the next attempts")
         await self.delete_game()
         self.timer.stop()
 
@@ -748,6 +810,20 @@ class GameScreenContainer(SceneScreenContainer):
             self.dismiss(self.map_chain)
             return
 
+        if game is not None and self.replay is None:
+            # Written in the background, the end screen reads it back
+            SCORES.add(
+                new_score(
+                    game.game_file,
+                    win,
+                    self.points.val,
+                    self.points.max_val,
+                    self.timer.time,
+                    game.replay_file,
+                ),
+                game.game_file,
+            )
+
         self.app.push_screen(
             EndScreen(
                 self.points.val,
@@ -763,6 +839,13 @@ class GameScreenContainer(SceneScreenContainer):
         get_textlog().write("Reset game")
         if self.is_reseting:
             return
+        if self.game is not None:
+            # Map is not loaded again, the game goes back to its first frame
+            self.timer.reset()
+            if isinstance(self.input_manager, ReplayInputManager):
+                self.input_manager.rewind()
+            self.game.restart()
+            return
         self.is_reseting = True
         await self.delete_game()
         await self.create_game()
@@ -772,7 +855,7 @@ class GameScreenContainer(SceneScreenContainer):
         if action == "to_menu":
             self.app.switch_screen("menu")
         elif action == "restart":
-            self.dismiss(self.map_chain)
+            await self.create_game()
         elif action == "next_level":
             self.map_chain.next_map()
             await self.create_game()
@@ -786,9 +869,15 @@ class GameScreenContainer(SceneScreenContainer):
     def mount_drawable(self, drawable: GameObjectStatic) -> None:
         self.game_display.mount_drawable(drawable)
 
+    def mount_drawables(self, drawables: Iterable[GameObjectStatic]) -> None:
+        self.game_display.mount_drawables(drawables)
+
     def delete_drawable(self, drawable: GameObjectStatic) -> None:
         self.game_display.delete_drawable(drawable)
 
+    def present(self, drawables: Iterable[GameObjectStatic] = ()) -> None:
+        self.game_display.present(drawables)
+
     # ===== Handle Game Events =====
 
     @on(PointCollected)
@@ -3,10 +3,11 @@ from __future__ import annotations
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
-from textual.widgets import Button
+from textual.widgets import Button, Static
 
 
-from textual import on
+from textual import on, work
+from tofu_byte.game.scores import SCORES
 from tofu_byte.mystatic import (
     GameDigits,
     Points,
@@ -20,6 +21,10 @@ from tofu_byte.screens.menu.map_loader import MapChain
 from tofu_byte.screens.screens import MenuScreenBase
 
 
+# Best runs of the map shown below the result
+SHOWN_SCORES = 3
+
+
 class EndScreen(MenuScreenBase[str]):
     BINDINGS = MenuScreenBase.BINDINGS + [Binding("r", "restart", "Restart game")]
 
@@ -52,6 +57,8 @@ class EndScreen(MenuScreenBase[str]):
         with Container():
             yield self.points
             yield self.game_time
+            self.best_scores = Static(id="best_scores")
+            yield self.best_scores
 
         with Container():
             if self.map_chain.has_next_map() and self.win:
@@ -60,6 +67,26 @@ class EndScreen(MenuScreenBase[str]):
             yield Button("Restart", id="restart", variant="primary")
             yield Button("Back to Menu", id="to_menu", variant="error")
 
+    def on_mount(self) -> None:
+        self.load_best_scores()
+
+    @work(thread=True, exclusive=True, group="scores")
+    def load_best_scores(self) -> None:
+        # Waits until the store wrote this run
+        scores = SCORES.top(self.map_chain.current_map(), SHOWN_SCORES)
+        lines: list[str] = []
+        for i, score in enumerate(scores, 1):
+            minutes, seconds = divmod(score.time, 60)
+            lines.append(
+                f"{i}. {minutes:02.0f}:{seconds:05.2f}  "
+                f"{score.points}x{score.max_points}"
+                + ("" if score.won else "  lost")
+            )
+        if lines:
+            self.app.call_from_thread(
+                self.best_scores.update, "Best runs\n" + "\n".join(lines)
+            )
+
     def action_restart(self):
         self.dismiss("restart")
 
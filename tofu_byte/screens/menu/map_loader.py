@@ -1,26 +1,34 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any, cast, NamedTuple
 from pathlib import Path
-import importlib.resources as res
 
-from textual import on
+from textual import on, work
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Grid, VerticalScroll
+from textual.events import DescendantFocus
 from textual.screen import ModalScreen
-from textual.widgets import Button, Input, Label
+from textual.widgets import Button, Input, Label, Static
 
-from tofu_byte.config import user_dir
+from tofu_byte.config import PROJECT_DIR, user_dir
 from tofu_byte.screens.const import LOAD_MAP
 from tofu_byte.mystatic import PrimaryScreenTitle
+from tofu_byte.objects.map import read_map
+from tofu_byte.objects.map_index import MapIndex, MapInfo
+from tofu_byte.objects.map_thumbnail import cached_thumbnail
 from tofu_byte.screens.screens import MenuScreenBase
 from tofu_byte.tools.map_utils import create_empty_map
 
 
 user_maps_dir = user_dir / "maps"
-user_maps_dir.mkdir(parents=True, exist_ok=True)
+builtin_maps_dir = PROJECT_DIR / "maps"
+
+MAP_INDEX = MapIndex()
+# Reads maps ahead, errors are raised again by `Future.result`
+PREFETCH = ThreadPoolExecutor(1, thread_name_prefix="prefetch")
 
 
 class MyPath(NamedTuple):
@@ -38,10 +46,32 @@ class NewMapData(NamedTuple):
 class MapChain:
     current_index: int
     maps: list[Path]
+    # Maps read ahead in the background, objects are still created on load
+    prefetched: dict[Path, Future[dict[Any, Any]]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
 
     def current_map(self) -> Path:
         return self.maps[self.current_index]
 
+    def current_map_config(self) -> dict[Any, Any]:
+        file = self.current_map()
+        future = self.prefetched.pop(file, None)
+        if future is not None:
+            try:
+                return future.result()
+            except (OSError, ValueError):
+                pass
+        return read_map(file)
+
+    def prefetch_next(self) -> None:
+        if not self.has_next_map():
+            return
+        file = self.maps[self.current_index + 1]
+        if file in self.prefetched:
+            return
+        self.prefetched[file] = PREFETCH.submit(read_map, file)
+
     def next_map(self) -> Path | None:
         if not self.has_next_map():
             return None
@@ -65,14 +95,13 @@ def list_builtin_root() -> list[MyPath]:
     custom: list[MyPath] = []
 
     # builtin packages / maps
-    for t in res.files("tofu_byte.maps").iterdir():
-        if t.is_dir() and t.name != "__pycache__":
-            packages.append(MyPath(Path(t), True, True))
-        elif t.name.endswith(".json"):
-            with res.as_file(t) as rp:
-                items.append(MyPath(Path(rp), True))
-
-    if any(user_maps_dir.iterdir()):
+    for name, is_dir in MAP_INDEX.children(builtin_maps_dir):
+        if is_dir and name != "__pycache__":
+            packages.append(MyPath(builtin_maps_dir / name, True, True))
+        elif name.endswith(".json"):
+            items.append(MyPath(builtin_maps_dir / name, True))
+
+    if MAP_INDEX.children(user_maps_dir):
         custom.append(USER_MAPS_PACKAGE)
 
     return (
@@ -86,11 +115,11 @@ def list_maps_in(path: Path) -> list[MyPath]:
     items: list[MyPath] = []
     packages: list[MyPath] = []
 
-    for p in path.iterdir():
-        if p.is_dir() and p.name != "__pycache__":
-            packages.append(MyPath(Path(p), path != user_maps_dir, True))
-        elif p.suffix == ".json":
-            items.append(MyPath(Path(p), path != user_maps_dir))
+    for name, is_dir in MAP_INDEX.children(path):
+        if is_dir and name != "__pycache__":
+            packages.append(MyPath(path / name, path != user_maps_dir, True))
+        elif name.endswith(".json"):
+            items.append(MyPath(path / name, path != user_maps_dir))
 
     return sorted(packages, key=lambda x: x.path.name) + sorted(
         items, key=lambda x: x.path.name
@@ -101,6 +130,8 @@ class MapButton(Button):
     def __init__(self, path: MyPath, *args: Any, **kwargs: Any):
         self.is_dir: bool = path.is_dir
         self.path: Path = path.path
+        self.info: MapInfo | None = None if path.is_dir else MAP_INDEX.info(path.path)
+        self.thumbnail: str | None = None
 
         text = path.path.stem
         if text.split("_")[0].isnumeric():
@@ -176,6 +207,8 @@ class MapLoader(MenuScreenBase[MapChain]):
         with VerticalScroll():
             pass
         with Container():
+            yield Static(id="map_preview")
+            yield Label(id="map_info")
             yield Button("Back", id="back", variant="error")
 
     def on_mount(self) -> None:
@@ -190,8 +223,54 @@ class MapLoader(MenuScreenBase[MapChain]):
         else:
             items = list_maps_in(self.current_path)
 
-        for p in items:
-            scroll.mount(MapButton(p, classes="map_button"))
+        buttons = [MapButton(p, classes="map_button") for p in items]
+        scroll.mount_all(buttons)
+        self.refresh_index([b.path for b in buttons if not b.is_dir and b.info is None])
+
+    @work(thread=True, exclusive=True, group="map_index")
+    def refresh_index(self, files: list[Path]) -> None:
+        # Maps that are new or changed since the index was saved
+        infos = {file: MAP_INDEX.refresh(file) for file in files}
+        MAP_INDEX.save()
+        if files:
+            self.app.call_from_thread(self.set_infos, infos)
+
+    def set_infos(self, infos: dict[Path, MapInfo | None]) -> None:
+        for button in self.query(MapButton):
+            if button.path in infos:
+                button.info = infos[button.path]
+        if isinstance(self.focused, MapButton):
+            self.show_info(self.focused)
+
+    def show_info(self, button: MapButton) -> None:
+        info = "" if button.info is None else button.info.describe()
+        self.query_one("#map_info", Label).update(info)
+
+    @work(thread=True, exclusive=True, group="thumbnail")
+    def load_thumbnail(self, button: MapButton) -> None:
+        try:
+            button.thumbnail = cached_thumbnail(button.path)
+        except (OSError, ValueError, KeyError, TypeError):
+            button.thumbnail = ""
+        self.app.call_from_thread(self.show_thumbnail, button)
+
+    def show_thumbnail(self, button: MapButton) -> None:
+        if self.focused is button:
+            self.query_one("#map_preview", Static).update(button.thumbnail or "")
+
+    @on(DescendantFocus)
+    def on_focus_button(self, event: DescendantFocus) -> None:
+        if not isinstance(event.widget, MapButton):
+            return
+        button = event.widget
+        self.show_info(button)
+        if button.is_dir:
+            self.query_one("#map_preview", Static).update("")
+        elif button.thumbnail is None:
+            # Generated only for maps the user goes through
+            self.load_thumbnail(button)
+        else:
+            self.show_thumbnail(button)
 
     @on(Button.Pressed, ".map_button")
     async def handle_press(self, event: Button.Pressed) -> None:
@@ -226,20 +305,10 @@ class MapEditor(MapLoader):
         with VerticalScroll():
             pass
         with Container():
+            yield Static(id="map_preview")
+            yield Label(id="map_info")
             yield Button("Back", id="back", variant="error")
 
-    def update(self) -> None:
-        scroll = self.query_one(VerticalScroll)
-        scroll.remove_children()
-
-        if self.current_path is None:
-            items = list_builtin_root()
-        else:
-            items = list_maps_in(self.current_path)
-
-        for p in items:
-            scroll.mount(MapButton(p, classes="map_button"))
-
     def _return_new_map(self, new_map_data: NewMapData) -> None:
         new_map_file = user_map(new_map_data.map_name)
         create_empty_map(new_map_file, new_map_data.authors)
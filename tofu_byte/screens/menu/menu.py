@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from textual.app import ComposeResult
 from textual.containers import Container
 from textual.widgets import Button, Footer
@@ -10,10 +12,11 @@ from tofu_byte.screens.const import MENU_TEXT
 from textual import on
 from tofu_byte.mystatic import PrimaryScreenTitle
 
-from tofu_byte.screens.game_display import GameScreenContainer, EditorScreenContainer
-from tofu_byte.screens.menu.map_loader import MapChain
 from tofu_byte.screens.screens import MenuScreenBase
 
+if TYPE_CHECKING:
+    from tofu_byte.screens.menu.map_loader import MapChain
+
 
 class Menu(MenuScreenBase[None]):
     def compose(self) -> ComposeResult:
@@ -29,13 +32,19 @@ class Menu(MenuScreenBase[None]):
         yield Footer()
 
     def on_back_from_game(self, map_chain: MapChain):
+        from tofu_byte.screens.game_display import GameScreenContainer
+
         if map_chain:
             self.app.push_screen(GameScreenContainer(map_chain), self.on_back_from_game)
 
     def on_load_game(self, map_chain: MapChain) -> None:
+        from tofu_byte.screens.game_display import GameScreenContainer
+
         self.app.push_screen(GameScreenContainer(map_chain), self.on_back_from_game)
 
     def on_load_map_editor(self, map_chain: MapChain) -> None:
+        from tofu_byte.screens.game_display import EditorScreenContainer
+
         self.app.push_screen(EditorScreenContainer(map_chain))
 
     @on(Button.Pressed, "#map_loader")
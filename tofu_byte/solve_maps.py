@@ -0,0 +1,63 @@
+"""Checks that every star and the EndBall of maps can be reached and finds
+the shortest winning input.
+
+    tofubyte-solve
+    tofubyte-solve path/to/map.json --save
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from tofu_byte.compile_maps import find_json
+from tofu_byte.config import PROJECT_DIR, user_dir
+from tofu_byte.game.replay import new_replay_path
+from tofu_byte.game.solver import MAX_STATES, solve
+
+
+def run():
+    parser = argparse.ArgumentParser(prog="tofubyte-solve", description=__doc__)
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Maps or folders with maps, bundled and user maps by default",
+    )
+    parser.add_argument(
+        "--max-states",
+        type=int,
+        default=MAX_STATES,
+        help="Gives up on a map after this many search states",
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Saves every solution as a replay",
+    )
+    args = parser.parse_args()
+
+    paths = args.paths or [PROJECT_DIR / "maps", user_dir / "maps"]
+    unsolved = 0
+    for file in find_json(paths):
+        start = time.perf_counter()
+        try:
+            solution = solve(file, args.max_states)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Skipped {file}: {e}")
+            continue
+        print(f"{solution.describe()}\n{time.perf_counter() - start:.1f}s")
+        if not solution.solved:
+            unsolved += 1
+        elif args.save:
+            path = new_replay_path(file)
+            solution.replay().save(path)
+            print(f"saved {path}")
+        print()
+    sys.exit(1 if unsolved else 0)
+
+
+if __name__ == "__main__":
+    run()
@@ -1,3 +1,5 @@
+from rich.style import Style
+from textual.color import Color
 from textual.theme import Theme
 
 
@@ -287,3 +289,40 @@ TOFU_BUILTIN_THEMES = {
         variables={"player-color": "#0056B3"},
     ),
 }
+
+
+class Palette:
+    """Theme variables the game draws with, parsed once for every theme."""
+
+    def __init__(self, theme: Theme) -> None:
+        self.name = theme.name
+        self.variables = {**theme.to_color_system().generate(), **theme.variables}
+        self.variables.setdefault("player-color", self.variables["accent"])
+        self.colors: dict[str, Color] = {}
+        self.styles: dict[tuple[str | None, str | None], Style] = {}
+
+    def color(self, name: str) -> Color:
+        color = self.colors.get(name)
+        if color is None:
+            color = self.colors[name] = Color.parse(self.variables[name])
+        return color
+
+    def style(self, color: str | None, background: str | None = None) -> Style:
+        style = self.styles.get((color, background))
+        if style is None:
+            style = self.styles[color, background] = Style(
+                color=self.color(color).rich_color if color else None,
+                bgcolor=self.color(background).rich_color if background else None,
+            )
+        return style
+
+
+_palettes: dict[str, Palette] = {}
+
+
+def palette_for(theme: Theme) -> Palette:
+    # Themes do not change after they are registered
+    palette = _palettes.get(theme.name)
+    if palette is None:
+        palette = _palettes[theme.name] = Palette(theme)
+    return palette
@@ -26,23 +26,31 @@ class bColor(NamedTuple):
         return cls(color=c, triplet=t, c_blended=d)
 
 
-BLUE = bColor.full("blue")
-GREEN = bColor.full("green")
-MAGENTA = bColor.full("magenta")
-RED = bColor.full("red")
-WHITE = bColor.full("white")
-# WHITE = "white"
-BLACK = bColor.full("rgb(0,0,0)")
-# BLACK = "black"
-DARK_BLUE = bColor.full("rgb(0,100,150)")
-DARK_ORANGE = bColor.full("rgb(92,56,32)")
-LIME = bColor.full("rgb(5, 235, 20)")
 r, g, b = randint(0, 255), randint(0, 255), randint(0, 255)
-RANDOM = bColor.full(f"rgb({r},{g},{b})")
+# Blend tables are built on first use, see `__getattr__`
+BCOLORS = {
+    "BLUE": "blue",
+    "GREEN": "green",
+    "MAGENTA": "magenta",
+    "RED": "red",
+    "WHITE": "white",
+    "BLACK": "rgb(0,0,0)",
+    "DARK_BLUE": "rgb(0,100,150)",
+    "DARK_ORANGE": "rgb(92,56,32)",
+    "LIME": "rgb(5, 235, 20)",
+    "RANDOM": f"rgb({r},{g},{b})",
+}
+BCOLORS["PLAYER"] = BCOLORS["LIME"]
 
-BACKGROUND = "rgb(10,10,20)"
 
-PLAYER = LIME
+def __getattr__(name: str) -> bColor:
+    if name not in BCOLORS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = bColor.full(BCOLORS[name])
+    return value
+
+
+BACKGROUND = "rgb(10,10,20)"
 
 # GROUND_BOTTOM = WHITE
 GROUND_BOTTOM = "rgb(50,50,65)"
@@ -14,5 +14,6 @@ def create_empty_map(file_name: Path, app_authors: list[str] = [APP_AUTHOR]):
         "max_points": 1,
         "hp": 1,
     }
+    file_name.parent.mkdir(parents=True, exist_ok=True)
     with open(file_name, "w") as file:
         json.dump(empty_map, file)
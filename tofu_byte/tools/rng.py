@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import random
+
+# Seeded at the start of every run, so a replay draws the same numbers
+run_random = random.Random()
+
+
+def seed_run(seed: int | None = None) -> int:
+    if seed is None:
+        seed = random.randrange(2**32)
+    run_random.seed(seed)
+    return seed
+
+
+def object_random() -> random.Random:
+    # Every object gets its own stream, so the order in which objects
+    # are updated does not change what they draw
+    return random.Random(run_random.getrandbits(32))
@@ -10,6 +10,10 @@ Direction = Literal["l", "r", "d", "u"]
 # Offset = namedtuple("Offset", ["y", "x"])
 
 
+def pressed(*directions: Direction) -> frozenset[Direction]:
+    return frozenset(directions)
+
+
 def mn_mx(x, mn, mx):
     return min(max(x, mn), mx)
 